@@ -7,27 +7,116 @@ your code never leaves your machine.
 """
 
 import argparse
+import json
 import os
-import tempfile
+import queue
+import subprocess
 import shutil
 import webbrowser
 import threading
-from flask import Flask, request, jsonify, send_from_directory
-from scanner import scan_file, scan_directory, build_prompt, LEVEL_NAMES, SUPPORTED_EXTS
+from dataclasses import asdict
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from scanner import (
+    scan_file, scan_bytes, scan_directory, iter_directory, build_prompt, ScanStats,
+    finding_to_dict, finding_sort_key, LEVEL_NAMES, SUPPORTED_EXTS, SKIP_DIRS,
+)
+
+try:
+    import orjson
+except ImportError:  # optional — Flask's stdlib json provider is used instead
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional — responses are sent uncompressed
+    Compress = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson — much faster on big finding lists."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+
+def ndjson_line(obj):
+    """Serialize one record (a dict or Finding) as a newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    if not isinstance(obj, dict):
+        obj = finding_to_dict(obj)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode()
+
 
 app = Flask(__name__, static_folder="static", static_url_path="/static")
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+if Compress is not None:
+    # Finding lists repeat the same paths and check names over and over, so
+    # even the fastest gzip level shrinks them several times over
+    app.config.update(
+        COMPRESS_MIMETYPES=["application/json", "application/x-ndjson", "text/plain"],
+        COMPRESS_MIN_SIZE=1024,
+        COMPRESS_ALGORITHM="gzip",
+        COMPRESS_ALGORITHM_STREAMING="gzip",
+        COMPRESS_LEVEL=1,
+    )
+    Compress(app)
 
 # ============================================================
 # State
 # ============================================================
 
+# Summary of the most recent scan — the findings themselves aren't kept
 last_scan = {
-    "findings": [],
     "path": "",
     "levels": [],
     "prompt": "",
+    "stats": {},
 }
 
+# Limits a scan request may override (see scanner.scan_file)
+SCAN_LIMITS = ("max_file_bytes", "max_line_length", "max_findings")
+
+
+def scan_limits(data):
+    """Pick the scan limits out of a scan request. Raises ValueError if malformed."""
+    limits = {}
+    for key in SCAN_LIMITS:
+        if data.get(key) is not None:
+            value = data[key]
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ValueError(f"`{key}` must be a non-negative integer (0 = no limit)")
+            limits[key] = value
+    return limits
+
+
+def scan_levels(data):
+    """Pick the calibration levels out of a scan request. Raises ValueError if malformed."""
+    levels = data.get("levels", [1, 2])
+    if not (isinstance(levels, list)
+            and all(isinstance(level, int) and not isinstance(level, bool) for level in levels)):
+        raise ValueError("`levels` must be a list of integers, e.g. [1, 2, 3]")
+    return levels
+
+
+def scan_ext_filter(data):
+    """Pick the `ext` filter out of a scan request. Raises ValueError if malformed."""
+    ext_filter = data.get("ext")
+    if ext_filter is not None and not (
+            isinstance(ext_filter, list) and all(isinstance(ext, str) for ext in ext_filter)):
+        raise ValueError("`ext` must be a list of file extensions, e.g. [\".py\"]")
+    return ext_filter
+
 # ============================================================
 # Routes
 # ============================================================
@@ -41,42 +130,42 @@ def index():
 def api_scan():
     """Scan a path at the given calibration levels.
 
-    POST JSON: { "path": "/path/to/code", "levels": [1,2,3], "ext": [".py"] }
+    POST JSON: { "path": "/path/to/code", "levels": [1,2,3], "ext": [".py"],
+                 "max_file_bytes": 1000000, "max_line_length": 5000, "max_findings": 50 }
+
+    Files over either size limit are skipped with an info finding, and each
+    check keeps at most `max_findings` per file (0 = no limit).
     """
     data = request.get_json(force=True)
     target = data.get("path", ".")
-    levels = data.get("levels", [1, 2])
-    ext_filter = data.get("ext", None)
+    try:
+        levels = scan_levels(data)
+        ext_filter = scan_ext_filter(data)
+        limits = scan_limits(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     if not os.path.exists(target):
         return jsonify({"error": f"Path not found: {target}"}), 400
 
     if os.path.isfile(target):
-        findings = scan_file(target, levels)
+        findings = scan_file(target, levels, **limits)
+        stats = ScanStats()
+        stats.add_file(findings)
         base_dir = os.path.dirname(target)
     else:
-        findings = scan_directory(target, levels, ext_filter)
+        findings, stats = scan_directory(target, levels, ext_filter, **limits)
         base_dir = target
 
     prompt = build_prompt(findings, base_dir=base_dir)
+    stats = asdict(stats)
 
     # Store last scan
-    last_scan["findings"] = [f.to_dict() for f in findings]
-    last_scan["path"] = target
-    last_scan["levels"] = levels
-    last_scan["prompt"] = prompt
-
-    # Stats
-    stats = {
-        "total": len(findings),
-        "errors": sum(1 for f in findings if f.severity == "error"),
-        "warnings": sum(1 for f in findings if f.severity == "warning"),
-        "infos": sum(1 for f in findings if f.severity == "info"),
-        "files_scanned": len(set(f.file for f in findings)),
-    }
+    last_scan.update(path=target, levels=levels, prompt=prompt, stats=stats)
 
+    # Findings are dataclasses — the JSON provider serializes them directly
     return jsonify({
-        "findings": last_scan["findings"],
+        "findings": findings,
         "prompt": prompt,
         "stats": stats,
         "path": target,
@@ -84,6 +173,55 @@ def api_scan():
     })
 
 
+@app.route("/api/scan/stream", methods=["POST"])
+def api_scan_stream():
+    """Scan a path and stream findings back as NDJSON while the scan runs.
+
+    POST JSON: same as /api/scan. Each line is one finding; the last line is
+    { "done": true, "stats": {...}, "prompt": "...", "path": ..., "levels": [...] }.
+    """
+    data = request.get_json(force=True)
+    target = data.get("path", ".")
+    try:
+        levels = scan_levels(data)
+        ext_filter = scan_ext_filter(data)
+        limits = scan_limits(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not os.path.exists(target):
+        return jsonify({"error": f"Path not found: {target}"}), 400
+
+    if os.path.isfile(target):
+        batches = iter([scan_file(target, levels, **limits)])
+        base_dir = os.path.dirname(target)
+    else:
+        batches = iter_directory(target, levels, ext_filter, **limits)
+        base_dir = target
+
+    def generate():
+        findings = []
+        stats = ScanStats()
+        for file_findings in batches:
+            findings.extend(file_findings)
+            stats.add_file(file_findings)
+            # One chunk per file keeps writes few without holding results back
+            yield b"".join(map(ndjson_line, file_findings))
+
+        prompt = build_prompt(findings, base_dir=base_dir)
+        stats = asdict(stats)
+        last_scan.update(path=target, levels=levels, prompt=prompt, stats=stats)
+        yield ndjson_line({
+            "done": True,
+            "prompt": prompt,
+            "stats": stats,
+            "path": target,
+            "levels": levels,
+        })
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
 @app.route("/api/prompt")
 def api_prompt():
     """Get the last generated prompt."""
@@ -94,7 +232,7 @@ def api_prompt():
 def api_upload_scan():
     """Scan uploaded files. Accepts multipart/form-data with files and levels.
 
-    Files are saved to a temp directory, scanned, then cleaned up.
+    Files are scanned straight from memory — nothing is written to disk.
     Each file's relative path is preserved via the 'paths[]' field.
     """
     levels_raw = request.form.get("levels", "1,2")
@@ -106,57 +244,109 @@ def api_upload_scan():
     if not files:
         return jsonify({"error": "No files uploaded"}), 400
 
-    # Create a temp dir to hold uploaded files
-    tmp_dir = tempfile.mkdtemp(prefix="bee_scan_")
+    # Same filtering a directory scan applies: supported extensions, no vendored dirs.
+    # A later upload with the same path replaces an earlier one.
+    uploads = {}
+    exts = tuple(SUPPORTED_EXTS)
+    for i, f in enumerate(files):
+        # Use the relative path if provided, otherwise the filename
+        rel_path = paths[i] if i < len(paths) else f.filename
+        # Sanitise: prevent traversal, strip leading slashes
+        rel_path = rel_path.replace("..", "").lstrip("/")
+        if not rel_path or not rel_path.endswith(exts):
+            continue
+        if any(part in SKIP_DIRS for part in rel_path.split("/")[:-1]):
+            continue
+        uploads[rel_path] = f
+
+    # Scanned one after another: the checks are pure-Python regex work that holds
+    # the GIL, so a thread pool wouldn't run them any faster
+    findings = []
+    stats = ScanStats()
+    for rel_path, f in uploads.items():
+        file_findings = scan_bytes(rel_path, f.read(), levels)
+        findings.extend(file_findings)
+        stats.add_file(file_findings)
+    findings.sort(key=finding_sort_key)
+
+    prompt = build_prompt(findings)
+    stats = asdict(stats)
 
-    try:
-        saved_files = []
-        for i, f in enumerate(files):
-            # Use the relative path if provided, otherwise the filename
-            rel_path = paths[i] if i < len(paths) else f.filename
-            # Sanitise: strip leading slashes, prevent traversal
-            rel_path = rel_path.lstrip("/").replace("..", "")
-            if not rel_path:
-                continue
-
-            dest = os.path.join(tmp_dir, rel_path)
-            os.makedirs(os.path.dirname(dest), exist_ok=True)
-            f.save(dest)
-            saved_files.append(dest)
-
-        # Scan the temp directory
-        findings = scan_directory(tmp_dir, levels)
-        prompt = build_prompt(findings, base_dir=tmp_dir)
-
-        # Store last scan
-        last_scan["findings"] = [f_item.to_dict() for f_item in findings]
-        last_scan["path"] = "uploaded files"
-        last_scan["levels"] = levels
-        last_scan["prompt"] = prompt
-
-        stats = {
-            "total": len(findings),
-            "errors": sum(1 for f_item in findings if f_item.severity == "error"),
-            "warnings": sum(1 for f_item in findings if f_item.severity == "warning"),
-            "infos": sum(1 for f_item in findings if f_item.severity == "info"),
-            "files_scanned": len(set(f_item.file for f_item in findings)),
-        }
+    # Store last scan
+    last_scan.update(path="uploaded files", levels=levels, prompt=prompt, stats=stats)
 
-        return jsonify({
-            "findings": last_scan["findings"],
-            "prompt": prompt,
-            "stats": stats,
-            "path": "uploaded files",
-            "levels": levels,
-        })
+    return jsonify({
+        "findings": findings,
+        "prompt": prompt,
+        "stats": stats,
+        "path": "uploaded files",
+        "levels": levels,
+    })
+
+
+# ============================================================
+# Hive search — resident Rust seeder
+# ============================================================
 
-    finally:
-        # Always clean up temp files
-        shutil.rmtree(tmp_dir, ignore_errors=True)
+SEEDER_BIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "target", "release", "bee-bytez")
+HIVE_TIMEOUT = 60
 
 
-import subprocess
-import json as json_module
+class HiveSeeder:
+    """One long-lived `bee-bytez --serve` process, spoken to one JSON line at a time.
+
+    The seeder keeps each directory's index in memory between queries, so
+    only the first search of a tree pays for loading it.
+    """
+
+    def __init__(self, binary):
+        self.binary = binary
+        self.lock = threading.Lock()
+        self.proc = None
+        self.replies = None
+
+    def _start(self):
+        self.proc = subprocess.Popen([self.binary, "--serve"],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.replies = queue.Queue()
+        threading.Thread(target=self._read, args=(self.proc, self.replies), daemon=True).start()
+
+    @staticmethod
+    def _read(proc, replies):
+        # A reader thread lets query() give up on a stuck seeder after a timeout
+        for line in proc.stdout:
+            replies.put(line)
+        replies.put(None)
+
+    def _stop(self):
+        if self.proc is not None:
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = None
+
+    def query(self, request_obj, timeout=HIVE_TIMEOUT):
+        """Send one request and return the parsed reply, (re)starting the seeder if needed."""
+        with self.lock:
+            if self.proc is None or self.proc.poll() is not None:
+                self._start()
+            try:
+                self.proc.stdin.write(ndjson_line(request_obj))
+                self.proc.stdin.flush()
+                reply = self.replies.get(timeout=timeout)
+                if reply is None:
+                    raise RuntimeError("Seeder exited unexpectedly")
+                return app.json.loads(reply)
+            except queue.Empty:
+                self._stop()
+                raise subprocess.TimeoutExpired(self.binary, timeout)
+            except Exception:
+                # Don't leave a half-answered request behind for the next caller
+                self._stop()
+                raise
+
+
+hive_seeder = HiveSeeder(SEEDER_BIN)
+
 
 @app.route("/api/hive-search", methods=["POST"])
 def api_hive_search():
@@ -177,21 +367,14 @@ def api_hive_search():
         return jsonify({"error": f"Path not found: {target}"}), 400
 
     # Find the Rust seeder binary
-    seeder_bin = os.path.join(os.path.dirname(os.path.abspath(__file__)), "target", "release", "bee-bytez")
-    if not os.path.isfile(seeder_bin):
+    if not os.path.isfile(SEEDER_BIN):
         return jsonify({"error": "Seeder binary not found. Run: cargo build --release"}), 500
 
     try:
-        result = subprocess.run(
-            [seeder_bin, target, "--json-query", query, "--top", str(top_k)],
-            capture_output=True, text=True, timeout=60
-        )
-
-        if result.returncode != 0:
-            return jsonify({"error": f"Seeder failed: {result.stderr[:200]}"}), 500
+        seeder_output = hive_seeder.query({"path": target, "query": query, "top": top_k})
 
-        # Parse JSON from stdout
-        seeder_output = json_module.loads(result.stdout)
+        if "error" in seeder_output:
+            return jsonify({"error": f"Seeder failed: {seeder_output['error'][:200]}"}), 500
 
         return jsonify({
             "query": query,
@@ -202,8 +385,8 @@ def api_hive_search():
         })
 
     except subprocess.TimeoutExpired:
-        return jsonify({"error": "Search timed out (60s limit)"}), 504
-    except json_module.JSONDecodeError as e:
+        return jsonify({"error": f"Search timed out ({HIVE_TIMEOUT}s limit)"}), 504
+    except json.JSONDecodeError as e:
         return jsonify({"error": f"Failed to parse seeder output: {e}"}), 500
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -13,10 +13,41 @@ Calibration Levels:
 """
 
 import base64
+import bisect
+import io
+import itertools
+import logging
+import mmap
 import os
+import queue
 import re
+import signal
+import string
+import threading
+import tokenize
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, deque
 from dataclasses import dataclass, field
-from pathlib import Path
+from functools import cached_property, lru_cache, partial
+from operator import attrgetter
+
+import scanner_cache
+
+try:
+    import ahocorasick
+except ImportError:  # optional — falls back to word regex + dict lookup
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # optional — falls back to the pure `re` path
+    hyperscan = None
+
+# Bump whenever a check changes what it reports — invalidates cached results
+SCANNER_VERSION = "8"
+
+_log = logging.getLogger(__name__)
 
 # ============================================================
 # Finding — one detected issue
@@ -24,6 +55,9 @@ from pathlib import Path
 
 @dataclass
 class Finding:
+    # Big scans hold thousands of these — skip the per-instance __dict__
+    __slots__ = ("file", "line", "level", "severity", "check", "message")
+
     file: str
     line: int
     level: int          # 1-4
@@ -31,15 +65,47 @@ class Finding:
     check: str          # short check name
     message: str        # human-readable description
 
-    def to_dict(self):
-        return {
-            "file": self.file,
-            "line": self.line,
-            "level": self.level,
-            "severity": self.severity,
-            "check": self.check,
-            "message": self.message,
-        }
+
+# Sort key for findings: by file, then line. attrgetter builds the key
+# tuple in C instead of running a Python lambda per finding.
+finding_sort_key = attrgetter("file", "line")
+
+
+def finding_to_dict(f):
+    """Plain-dict form of a Finding, for JSON encoders that don't take dataclasses."""
+    return {
+        "file": f.file,
+        "line": f.line,
+        "level": f.level,
+        "severity": f.severity,
+        "check": f.check,
+        "message": f.message,
+    }
+
+
+@dataclass
+class ScanStats:
+    """Finding counts for a scan, kept up to date as each file's results come in."""
+    total: int = 0
+    errors: int = 0
+    warnings: int = 0
+    infos: int = 0
+    files_scanned: int = 0      # files with at least one finding
+
+    def add_file(self, findings):
+        """Count one file's findings."""
+        if not findings:
+            return
+        self.files_scanned += 1
+        self.total += len(findings)
+        for f in findings:
+            severity = f.severity
+            if severity == "error":
+                self.errors += 1
+            elif severity == "warning":
+                self.warnings += 1
+            elif severity == "info":
+                self.infos += 1
 
 # ============================================================
 # Common typo dictionary
@@ -67,16 +133,93 @@ TYPOS = {
     "direcotry": "directory", "fitler": "filter",
 }
 
+
+def _build_typo_automaton():
+    automaton = ahocorasick.Automaton()
+    for typo, fix in TYPOS.items():
+        automaton.add_word(typo, (typo, fix))
+    automaton.make_automaton()
+    return automaton
+
+
+# One Aho–Corasick automaton over every typo — a single linear pass per comment
+_TYPO_AUTOMATON = _build_typo_automaton() if ahocorasick else None
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+_RE_STRING_LITERAL = re.compile(r'["\']([^"\']{3,})["\']')
+_RE_WORD = re.compile(r"[a-zA-Z]+")
+
+def _iter_lines(lines, candidates=None):
+    """Yield (line_no, line) pairs — every line, or only the candidate line numbers."""
+    if candidates is None:
+        return enumerate(lines, 1)
+    return ((i, lines[i - 1]) for i in candidates)
+
+
+class ScanContext:
+    """One file as the checks see it, plus views of it built on first use.
+
+    Every check takes one of these, so the whole-text view is joined once
+    per file however many checks search it.
+    """
+
+    def __init__(self, filepath, lines, data=None):
+        self.filepath = filepath
+        self.lines = lines
+        self.data = data  # the raw bytes (or mmap) the lines were decoded from, if known
+
+    @cached_property
+    def text(self):
+        """The lines joined with "\n"."""
+        return "\n".join(self.lines)
+
+    @cached_property
+    def line_starts(self):
+        """Offset of each line in `text`, plus one past the end."""
+        return [0, *itertools.accumulate(len(line) + 1 for line in self.lines)]
+
+    def lines_containing(self, anchors, text=None):
+        """Sorted numbers of the lines containing any of `anchors` (no newlines).
+
+        One C-level str.find over `text` per anchor instead of a Python
+        iteration per line; line numbers come back via bisect. Pass `text`
+        to search a same-length transform of it instead, e.g. the lowercased
+        text of an ASCII file.
+        """
+        found = set()
+        starts = self.line_starts
+        find = (self.text if text is None else text).find
+        for anchor in anchors:
+            pos = find(anchor)
+            while pos != -1:
+                i = bisect.bisect_right(starts, pos)
+                found.add(i)
+                pos = find(anchor, starts[i])  # one hit per line is enough
+        return sorted(found)
+
+
 # ============================================================
 # Level 1 — Lint Checks
 # ============================================================
 
-def check_file_type(filepath, lines):
+# Extensions that settle the file type on their own — no header sniffing needed
+EXT_TO_FTYPE = {
+    ".py": "Python Source", ".rs": "Rust Source", ".c": "C/C++ Source", ".h": "C/C++ Source",
+    ".js": "JavaScript", ".ts": "TypeScript", ".java": "Java Source", ".go": "Go Source",
+    ".rb": "Ruby Source", ".toml": "TOML Config", ".yaml": "YAML Config", ".yml": "YAML Config",
+}
+
+
+def check_file_type(ctx):
     """Detect file type based on header/shebang/extension. report Unknown if not found."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
     if not lines:
         return [Finding(filepath, 1, 1, "info", "file_type", "Empty file")]
 
+    ext = os.path.splitext(filepath)[1]
+    if ext in EXT_TO_FTYPE:
+        return [Finding(filepath, 1, 1, "info", "file_type", f"File Type: {EXT_TO_FTYPE[ext]}")]
+
     first_line = lines[0].strip()
     ftype = "Unknown"
     
@@ -113,7 +256,6 @@ def check_file_type(filepath, lines):
     
     if ftype == "Unknown":
         # Fallback to extension if header failed
-        ext = os.path.splitext(filepath)[1]
         if ext in SUPPORTED_EXTS:
              msg = f"File Type: {ext} source (No header detected)"
         else:
@@ -128,8 +270,9 @@ def check_file_type(filepath, lines):
     return findings
 
 
-def check_typos(filepath, lines):
+def check_typos(ctx):
     """Find common typos in comments and strings."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
     for i, line in enumerate(lines, 1):
         # Only check comments and strings, not code identifiers
@@ -141,13 +284,29 @@ def check_typos(filepath, lines):
 
         if not comment:
             # Check string literals
-            strings = re.findall(r'["\']([^"\']{3,})["\']', line)
+            strings = _RE_STRING_LITERAL.findall(line)
             comment = " ".join(strings)
 
         if not comment:
             continue
 
-        words = re.findall(r"[a-zA-Z]+", comment)
+        if _TYPO_AUTOMATON is not None and comment.isascii():
+            last = len(comment) - 1
+            for end, (typo, fix) in _TYPO_AUTOMATON.iter(comment.lower()):
+                start = end - len(typo) + 1
+                # Whole words only — a hit inside a longer run of letters isn't a typo
+                if start > 0 and comment[start - 1] in _ASCII_LETTERS:
+                    continue
+                if end < last and comment[end + 1] in _ASCII_LETTERS:
+                    continue
+                findings.append(Finding(
+                    file=filepath, line=i, level=1, severity="info",
+                    check="typo",
+                    message=f'Typo: "{comment[start:end + 1]}" → "{fix}"'
+                ))
+            continue
+
+        words = _RE_WORD.findall(comment)
         for word in words:
             lower = word.lower()
             if lower in TYPOS:
@@ -159,160 +318,134 @@ def check_typos(filepath, lines):
     return findings
 
 
-def check_todo_fixme(filepath, lines):
-    """Flag TODO, FIXME, HACK, XXX, TEMP markers."""
-    findings = []
-    pattern = re.compile(r"\b(TODO|FIXME|HACK|XXX|TEMP|WORKAROUND)\b", re.IGNORECASE)
-    for i, line in enumerate(lines, 1):
-        match = pattern.search(line)
-        if match:
-            tag = match.group(1).upper()
-            rest = line[match.end():].strip().lstrip(":").strip()
-            msg = f"{tag} marker"
-            if rest:
-                msg += f": {rest[:80]}"
-            findings.append(Finding(
-                file=filepath, line=i, level=1, severity="info",
-                check="todo", message=msg
-            ))
-    return findings
-
+_RE_IDENT = re.compile(r"[A-Za-z_]\w*")
+_RE_IMPORT_FROM = re.compile(r"from\s+\S+\s+import\s+(.+)")
+_RE_IMPORT = re.compile(r"import\s+(\S+)(?:\s+as\s+(\w+))?")
 
-def check_naming_consistency(filepath, lines):
-    """Detect mixed snake_case and camelCase function/variable definitions."""
-    snake_defs = []
-    camel_defs = []
-    snake_pat = re.compile(r"(?:def|let|var|const)\s+([a-z][a-z0-9]*(?:_[a-z0-9]+)+)")
-    camel_pat = re.compile(r"(?:def|let|var|const)\s+([a-z]+[A-Z][a-zA-Z0-9]*)")
 
-    for i, line in enumerate(lines, 1):
-        if snake_pat.search(line):
-            snake_defs.append(i)
-        if camel_pat.search(line):
-            camel_defs.append(i)
+def _used_names(text, skip_lines):
+    """Collect every identifier referenced in `text`, ignoring tokens on `skip_lines`.
 
-    findings = []
-    # Only flag if BOTH styles exist (inconsistency)
-    if snake_defs and camel_defs:
-        minority = camel_defs if len(camel_defs) < len(snake_defs) else snake_defs
-        style = "camelCase" if len(camel_defs) < len(snake_defs) else "snake_case"
-        for line_num in minority[:5]:  # Cap at 5 to avoid flooding
-            findings.append(Finding(
-                file=filepath, line=line_num, level=1, severity="info",
-                check="naming",
-                message=f"Inconsistent naming: {style} used here but file is mostly {'snake_case' if style == 'camelCase' else 'camelCase'}"
-            ))
-    return findings
+    Raises tokenize.TokenError / SyntaxError if the file doesn't tokenize.
+    """
+    names = set()
+    for tok in tokenize.generate_tokens(io.StringIO(text).readline):
+        if tok.start[0] in skip_lines:
+            continue
+        if tok.type == tokenize.NAME:
+            names.add(tok.string)
+        elif tok.type == tokenize.STRING:
+            # __all__ entries, string annotations like 'Optional[int]', and
+            # f-string expressions (one STRING token before Python 3.12)
+            s = tok.string
+            names.update(_RE_IDENT.findall(s, s.index(s[-1])))
+    return names
 
 
-def check_unused_imports(filepath, lines):
+def check_unused_imports(ctx):
     """Detect Python imports that are never referenced in the rest of the file."""
+    filepath, lines = ctx.filepath, ctx.lines
     if not filepath.endswith(".py"):
         return []
 
-    findings = []
-    full_text = "\n".join(lines)
-
+    # (line number, imported name, last line of the import statement) for every import
+    imports = []
+    import_lines = set()
+    statement = None  # [first line, names so far] of a `from X import` still open
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
 
-        # from X import Y, Z
-        m = re.match(r"from\s+\S+\s+import\s+(.+)", stripped)
-        if m:
-            names = [n.strip().split(" as ")[-1].strip() for n in m.group(1).split(",")]
-            for name in names:
-                if not name or name == "*":
-                    continue
-                # Check if name appears anywhere AFTER the import
-                rest = "\n".join(lines[i:])
-                # Simple word-boundary check
-                if not re.search(r"\b" + re.escape(name) + r"\b", rest):
-                    findings.append(Finding(
-                        file=filepath, line=i, level=1, severity="info",
-                        check="unused_import",
-                        message=f"Unused import: `{name}` is imported but never used"
-                    ))
-            continue
-
-        # import X
-        m = re.match(r"import\s+(\S+)", stripped)
-        if m:
-            name = m.group(1).split(".")[-1]
-            rest = "\n".join(lines[i:])
-            if not re.search(r"\b" + re.escape(name) + r"\b", rest):
-                findings.append(Finding(
-                    file=filepath, line=i, level=1, severity="info",
-                    check="unused_import",
-                    message=f"Unused import: `{name}` is imported but never used"
-                ))
-    return findings
+        if statement is None:
+            # from X import Y, Z
+            m = _RE_IMPORT_FROM.match(stripped)
+            if m:
+                statement = [i, m.group(1).split("#", 1)[0]]
+            else:
+                # import X, Y / import X as Y
+                if _RE_IMPORT.match(stripped):
+                    import_lines.add(i)
+                    for part in stripped[len("import"):].split("#", 1)[0].split(","):
+                        words = part.split()
+                        name = words[-1] if len(words) == 3 and words[1] == "as" else part.strip().split(".")[-1]
+                        if name.isidentifier():
+                            imports.append((i, name, i))
+                continue
+        else:
+            statement[1] += " " + stripped.split("#", 1)[0]
 
+        # `from X import (` and a trailing backslash carry on to the next line
+        names = statement[1]
+        if ("(" in names and ")" not in names) or names.rstrip().endswith("\\"):
+            if i < len(lines):
+                continue
+        first = statement[0]
+        statement = None
+        import_lines.update(range(first, i + 1))
+        for part in names.replace("(", " ").replace(")", " ").replace("\\", " ").split(","):
+            words = part.split()  # `Y` or `Y as Z`
+            if words and words[-1].isidentifier():
+                imports.append((first, words[-1], i))
+
+    if not imports:
+        return []
 
-# ============================================================
-# Level 2 — Bug Hunt Checks
-# ============================================================
+    full_text = ctx.text
+    try:
+        # One tokenize pass: a name is used if it appears anywhere outside the imports
+        used = _used_names(full_text, import_lines)
+        is_used = lambda end, name: name in used
+    except (tokenize.TokenError, SyntaxError):
+        # Doesn't tokenize — fall back to a word search after each import
+        line_starts = ctx.line_starts
+        is_used = lambda end, name: re.compile(r"\b" + re.escape(name) + r"\b").search(full_text, line_starts[end])
 
-def check_bare_except(filepath, lines):
-    """Detect bare except clauses that swallow all exceptions."""
     findings = []
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        if stripped == "except:" or stripped.startswith("except:"):
+    for i, name, end in imports:
+        if not is_used(end, name):
             findings.append(Finding(
-                file=filepath, line=i, level=2, severity="warning",
-                check="bare_except",
-                message="Bare `except:` swallows all exceptions including KeyboardInterrupt and SystemExit. Use `except Exception:` instead."
+                file=filepath, line=i, level=1, severity="info",
+                check="unused_import",
+                message=f"Unused import: `{name}` is imported but never used"
             ))
-        elif re.match(r"except\s+\w+.*:\s*$", stripped):
-            # Check if next non-empty line is just `pass`
-            for j in range(i, min(i + 3, len(lines))):
-                next_line = lines[j].strip()
-                if next_line == "pass":
-                    findings.append(Finding(
-                        file=filepath, line=j + 1, level=2, severity="warning",
-                        check="swallowed_exception",
-                        message="Exception caught and silently swallowed with `pass`. At minimum, log the error."
-                    ))
-                    break
-                elif next_line and not next_line.startswith("#"):
-                    break
     return findings
 
 
-def check_mutable_defaults(filepath, lines):
-    """Detect mutable default arguments in Python function definitions."""
-    if not filepath.endswith(".py"):
-        return []
+# ============================================================
+# Level 2 — Bug Hunt Checks
+# ============================================================
 
-    findings = []
-    pattern = re.compile(r"def\s+\w+\s*\(.*?(=\s*(\[\]|\{\}|\bset\(\)))")
-    for i, line in enumerate(lines, 1):
-        if pattern.search(line):
-            findings.append(Finding(
-                file=filepath, line=i, level=2, severity="warning",
-                check="mutable_default",
-                message="Mutable default argument (list/dict/set). Use `None` as default and create inside the function."
-            ))
-    return findings
+_RE_TRUTHY_EQ = re.compile(r"return\s+self\s+and\s+other\s+and")
+_RE_CLASS = re.compile(r"\s*class\s+")
 
 
-def check_equality_issues(filepath, lines):
+def check_equality_issues(ctx):
     """Detect broken __eq__ implementations."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
     in_eq = False
-    eq_line = 0
+    saw_isinstance = False  # isinstance() seen earlier in the current __eq__
+    first_eq = None
+    has_hash = False
+    has_class = False
 
+    # One pass collects everything — scan_file skips files without `def __eq__`
     for i, line in enumerate(lines, 1):
         stripped = line.strip()
         if "def __eq__" in stripped:
             in_eq = True
-            eq_line = i
+            saw_isinstance = False
+            if first_eq is None:
+                first_eq = i
         elif in_eq and stripped.startswith("def "):
             in_eq = False
+        if not has_hash and "def __hash__" in line:
+            has_hash = True
+        if not has_class and _RE_CLASS.match(line):
+            has_class = True
 
         if in_eq:
             # Truthiness chaining: `return self and other and ...`
-            if re.search(r"return\s+self\s+and\s+other\s+and", stripped):
+            if _RE_TRUTHY_EQ.search(stripped):
                 findings.append(Finding(
                     file=filepath, line=i, level=2, severity="warning",
                     check="broken_eq",
@@ -320,18 +453,16 @@ def check_equality_issues(filepath, lines):
                 ))
 
             # No isinstance check
-            if "return" in stripped and "isinstance" not in "\n".join(lines[eq_line-1:i]):
+            if "return" in stripped and not saw_isinstance:
                 if "==" in stripped and "isinstance" not in stripped:
                     pass  # Only flag if there's no isinstance anywhere in __eq__
+            if "isinstance" in stripped:
+                saw_isinstance = True
 
     # __eq__ without __hash__
-    has_eq = any("def __eq__" in line for line in lines)
-    has_hash = any("def __hash__" in line for line in lines)
-    has_class = any(re.match(r"\s*class\s+", line) for line in lines)
-    if has_eq and not has_hash and has_class:
-        eq_idx = next(i for i, l in enumerate(lines, 1) if "def __eq__" in l)
+    if first_eq is not None and not has_hash and has_class:
         findings.append(Finding(
-            file=filepath, line=eq_idx, level=2, severity="info",
+            file=filepath, line=first_eq, level=2, severity="info",
             check="eq_without_hash",
             message="__eq__ defined without __hash__. Objects will be unhashable (can't use in sets/dicts)."
         ))
@@ -339,34 +470,13 @@ def check_equality_issues(filepath, lines):
     return findings
 
 
-def check_comparison_pitfalls(filepath, lines):
-    """Detect is/== confusion and None comparison issues."""
-    findings = []
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        if stripped.startswith("#") or stripped.startswith("//"):
-            continue
-
-        # `== None` instead of `is None`
-        if re.search(r"==\s*None\b", stripped) or re.search(r"!=\s*None\b", stripped):
-            findings.append(Finding(
-                file=filepath, line=i, level=2, severity="info",
-                check="none_comparison",
-                message="Use `is None` / `is not None` instead of `== None` / `!= None`."
-            ))
-
-        # `== True` / `== False`
-        if re.search(r"==\s*(True|False)\b", stripped):
-            findings.append(Finding(
-                file=filepath, line=i, level=2, severity="info",
-                check="bool_comparison",
-                message="Use `if x:` / `if not x:` instead of `== True` / `== False`."
-            ))
-    return findings
+# The only characters the bracket check cares about
+_RE_BRACKET_TOKEN = re.compile(r"""[()\[\]{}"']""")
 
 
-def check_bracket_mismatch(filepath, lines):
+def check_bracket_mismatch(ctx):
     """Detect mismatched brackets, parentheses, and braces."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
     pairs = {'(': ')', '[': ']', '{': '}'}
     openers = set(pairs.keys())
@@ -381,18 +491,20 @@ def check_bracket_mismatch(filepath, lines):
         if stripped.startswith("#") or stripped.startswith("//"):
             continue
 
+        # Jump straight to brackets and quotes instead of walking every character
         in_string = None
-        prev_char = None
-        for ch in line:
+        for m in _RE_BRACKET_TOKEN.finditer(line):
+            ch = m.group()
+            pos = m.start()
             # Track string state (skip brackets inside strings)
-            if ch in ('"', "'") and prev_char != '\\':
+            if ch in ('"', "'"):
+                if pos and line[pos - 1] == '\\':
+                    continue
                 if in_string is None:
                     in_string = ch
                 elif in_string == ch:
                     in_string = None
-                prev_char = ch
                 continue
-            prev_char = ch
 
             if in_string:
                 continue
@@ -428,47 +540,216 @@ def check_bracket_mismatch(filepath, lines):
     return findings
 
 
-def check_assignment_comparison(filepath, lines):
-    """Detect likely = vs == confusion."""
-    findings = []
-    for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-        if stripped.startswith("#") or stripped.startswith("//"):
-            continue
+# ============================================================
+# Level 1 + 2 — Fused line scan
+# ============================================================
+#
+# The simple per-line regex checks (TODOs, naming, bare except, mutable
+# defaults, None/bool comparisons, assignment in conditions) share one
+# compiled alternation: each line is scanned once and every hit is
+# dispatched on `lastgroup`. Groups only consume their trigger text so
+# checks that fire on the same line don't shadow each other.
+
+CHECKS_L1_L2 = [
+    ("todo", r"(?i:\b(?:TODO|FIXME|HACK|XXX|TEMP|WORKAROUND)\b)"),
+    ("definition", r"(?:def|let|var|const)\s+"),
+    ("condition", r"^\s*(?:if|elif|while)\s"),
+    ("handler", r"^\s*except\b"),
+    ("none_cmp", r"[=!]=\s*None\b"),
+    ("bool_cmp", r"==\s*(?:True|False)\b"),
+]
+
+_RE_SNAKE_DEF = re.compile(r"(?:def|let|var|const)\s+([a-z][a-z0-9]*(?:_[a-z0-9]+)+)")
+_RE_CAMEL_DEF = re.compile(r"(?:def|let|var|const)\s+([a-z]+[A-Z][a-zA-Z0-9]*)")
+# A mutable default is `def name(` then, anywhere after, one of these. Split
+# in two (the second half searched from the end of the first) instead of
+# a lazy `.*?` between them, which is quadratic on a line full of `def`s.
+_RE_MUTABLE_DEFAULT_DEF = re.compile(r"def\s+\w+\s*\(")
+_RE_MUTABLE_DEFAULT_VALUE = re.compile(r"=\s*(\[\]|\{\}|\bset\(\))")
+_RE_EXCEPT_TYPED = re.compile(r"except\s+\w+.*:\s*$")
+_RE_ASSIGN_COND_STRIP = re.compile(r"(==|!=|<=|>=|:=)")
+_RE_ASSIGN_COND_FIND = re.compile(r"[^!<>:=]=[^=]")
+
+# Levels served by the fused scan
+_LINE_SCAN_LEVELS = {1, 2}
+
+
+def _is_comment(line):
+    stripped = line.strip()
+    return stripped.startswith("#") or stripped.startswith("//")
+
+
+def _on_todo(scan, i, line, m):
+    if not scan.once(i, "todo"):
+        return
+    tag = m.group().upper()
+    rest = line[m.end():].strip().lstrip(":").strip()
+    msg = f"{tag} marker"
+    if rest:
+        msg += f": {rest[:80]}"
+    scan.add(i, 1, "info", "todo", msg)
+
+
+def _on_definition(scan, i, line, m):
+    if 1 in scan.levels:
+        if _RE_SNAKE_DEF.match(line, m.start()) and scan.once(i, "snake"):
+            scan.snake_defs.append(i)
+        if _RE_CAMEL_DEF.match(line, m.start()) and scan.once(i, "camel"):
+            scan.camel_defs.append(i)
+    if 2 in scan.levels and scan.is_py:
+        d = _RE_MUTABLE_DEFAULT_DEF.match(line, m.start())
+        if d and _RE_MUTABLE_DEFAULT_VALUE.search(line, d.end()) and scan.once(i, "mutable_default"):
+            scan.add(i, 2, "warning", "mutable_default",
+                     "Mutable default argument (list/dict/set). Use `None` as default and create inside the function.")
+
+
+def _on_condition(scan, i, line, m):
+    if _is_comment(line):
+        return
+    # Find single = that's not ==, !=, <=, >=, :=
+    condition = _RE_ASSIGN_COND_STRIP.sub("XX", line)
+    if _RE_ASSIGN_COND_FIND.search(condition):
+        scan.add(i, 2, "warning", "assign_in_condition",
+                 "Possible assignment `=` in condition — did you mean `==`?")
+
+
+def _on_handler(scan, i, line, m):
+    stripped = line.strip()
+    if stripped.startswith("except:"):
+        scan.add(i, 2, "warning", "bare_except",
+                 "Bare `except:` swallows all exceptions including KeyboardInterrupt and SystemExit. Use `except Exception:` instead.")
+    elif _RE_EXCEPT_TYPED.match(stripped):
+        # Check if next non-empty line is just `pass`
+        lines = scan.lines
+        for j in range(i, min(i + 3, len(lines))):
+            next_line = lines[j].strip()
+            if next_line == "pass":
+                scan.add(j + 1, 2, "warning", "swallowed_exception",
+                         "Exception caught and silently swallowed with `pass`. At minimum, log the error.")
+                break
+            elif next_line and not next_line.startswith("#"):
+                break
+
+
+def _on_none_cmp(scan, i, line, m):
+    if scan.once(i, "none_comparison") and not _is_comment(line):
+        scan.add(i, 2, "info", "none_comparison",
+                 "Use `is None` / `is not None` instead of `== None` / `!= None`.")
+
+
+def _on_bool_cmp(scan, i, line, m):
+    if scan.once(i, "bool_comparison") and not _is_comment(line):
+        scan.add(i, 2, "info", "bool_comparison",
+                 "Use `if x:` / `if not x:` instead of `== True` / `== False`.")
+
+
+# lastgroup → (level, handler). `definition` serves both levels.
+_LINE_HANDLERS = {
+    "todo": (1, _on_todo),
+    "definition": (None, _on_definition),
+    "condition": (2, _on_condition),
+    "handler": (2, _on_handler),
+    "none_cmp": (2, _on_none_cmp),
+    "bool_cmp": (2, _on_bool_cmp),
+}
 
-        # Inside if/while/elif — single = is suspicious (not ==, !=, <=, >=, :=)
-        if re.match(r"\s*(if|elif|while)\s+", line):
-            # Find single = that's not ==, !=, <=, >=, :=
-            condition = re.sub(r"(==|!=|<=|>=|:=)", "XX", line)
-            if re.search(r"[^!<>:=]=[^=]", condition):
-                findings.append(Finding(
-                    file=filepath, line=i, level=2, severity="warning",
-                    check="assign_in_condition",
-                    message="Possible assignment `=` in condition — did you mean `==`?"
-                ))
-    return findings
+
+def _line_group_wanted(name, levels):
+    level = _LINE_HANDLERS[name][0]
+    return level is None or level in levels
+
+
+@lru_cache(maxsize=None)
+def _master_pattern(levels):
+    """The fused alternation and its handlers, limited to groups `levels` needs.
+
+    A Quick Lint scan then never matches (and discards) the Level 2 triggers.
+    """
+    groups = [(name, pat) for name, pat in CHECKS_L1_L2 if _line_group_wanted(name, levels)]
+    pattern = re.compile("|".join(f"(?P<{name}>{pat})" for name, pat in groups))
+    handlers = {name: _LINE_HANDLERS[name][1] for name, _ in groups}
+    return pattern, handlers
+
+
+class _LineScan:
+    """Per-file state shared by the fused line handlers."""
+
+    def __init__(self, filepath, lines, levels):
+        self.filepath = filepath
+        self.lines = lines
+        self.levels = levels
+        self.is_py = filepath.endswith(".py")
+        self.findings = []
+        self.snake_defs = []
+        self.camel_defs = []
+        self._seen = set()
+
+    def add(self, line, level, severity, check, message):
+        self.findings.append(Finding(
+            file=self.filepath, line=line, level=level, severity=severity,
+            check=check, message=message
+        ))
+
+    def once(self, line, key):
+        """True the first time `key` fires on `line`."""
+        if (line, key) in self._seen:
+            return False
+        self._seen.add((line, key))
+        return True
+
+
+def _scan_lines(ctx, levels, candidates=None):
+    """Run every fused Level 1/2 line check in a single pass over the file's lines."""
+    lines = ctx.lines
+    scan = _LineScan(ctx.filepath, lines, levels)
+    pattern, handlers = _master_pattern(tuple(levels))
+    finditer = pattern.finditer
+
+    for i, line in _iter_lines(lines, candidates):
+        for m in finditer(line):
+            handlers[m.lastgroup](scan, i, line, m)
+
+    # Naming — only flag if BOTH styles exist (inconsistency)
+    snake_defs, camel_defs = scan.snake_defs, scan.camel_defs
+    if snake_defs and camel_defs:
+        minority = camel_defs if len(camel_defs) < len(snake_defs) else snake_defs
+        style = "camelCase" if len(camel_defs) < len(snake_defs) else "snake_case"
+        for line_num in minority[:5]:  # Cap at 5 to avoid flooding
+            scan.add(line_num, 1, "info", "naming",
+                     f"Inconsistent naming: {style} used here but file is mostly {'snake_case' if style == 'camelCase' else 'camelCase'}")
+
+    return scan.findings
 
 
 # ============================================================
 # Level 3 — Security Checks
 # ============================================================
 
-def check_command_injection(filepath, lines):
+# Compiled once here — the checks run them on every line of every file
+_CMD_INJECTION_RULES = tuple((re.compile(pattern), msg) for pattern, msg in [
+    (r"\bos\.system\s*\(", "os.system() runs shell commands — use subprocess.run() without shell=True"),
+    (r"\bos\.popen\s*\(", "os.popen() runs shell commands — use subprocess.run() instead"),
+    (r"subprocess\.\w+\(.*shell\s*=\s*True", "subprocess with shell=True enables shell injection"),
+    (r"\beval\s*\(", "eval() executes arbitrary code — avoid or restrict input"),
+    (r"\bexec\s*\(", "exec() executes arbitrary code — avoid or restrict input"),
+])
+
+# Literal text every rule above needs — only lines containing one are checked
+_CMD_ANCHORS = ("os.system", "os.popen", "subprocess.", "eval", "exec")
+
+
+def check_command_injection(ctx, candidates=None):
     """Detect potential command injection vectors."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    patterns = [
-        (r"\bos\.system\s*\(", "os.system() runs shell commands — use subprocess.run() without shell=True"),
-        (r"\bos\.popen\s*\(", "os.popen() runs shell commands — use subprocess.run() instead"),
-        (r"subprocess\.\w+\(.*shell\s*=\s*True", "subprocess with shell=True enables shell injection"),
-        (r"\beval\s*\(", "eval() executes arbitrary code — avoid or restrict input"),
-        (r"\bexec\s*\(", "exec() executes arbitrary code — avoid or restrict input"),
-    ]
-    for i, line in enumerate(lines, 1):
+    if candidates is None:
+        candidates = ctx.lines_containing(_CMD_ANCHORS)
+    for i, line in _iter_lines(lines, candidates):
         stripped = line.strip()
         if stripped.startswith("#") or stripped.startswith("//"):
             continue
-        for pattern, msg in patterns:
-            if re.search(pattern, stripped):
+        for pattern, msg in _CMD_INJECTION_RULES:
+            if pattern.search(stripped):
                 findings.append(Finding(
                     file=filepath, line=i, level=3, severity="error",
                     check="command_injection", message=msg
@@ -476,22 +757,44 @@ def check_command_injection(filepath, lines):
     return findings
 
 
-def check_hardcoded_secrets(filepath, lines):
+# Case-insensitive rules, written in lowercase. ASCII lines are lowercased
+# once and searched case-sensitively — cheaper than IGNORECASE on every
+# rule. Other lines keep IGNORECASE: re's Unicode case folding matches
+# characters that lower() maps elsewhere (e.g. "ſ" for "s").
+_SECRET_RULE_SOURCES = [
+    (r"""(?:password|passwd|pwd)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded password"),
+    (r"""(?:api_key|apikey|api_secret)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded API key"),
+    (r"""(?:secret|secret_key)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded secret"),
+    (r"""(?:token|access_token|auth_token)\s*=\s*['"][^'"]{8,}['"]""", "Hardcoded token"),
+    (r"""(?:aws_access_key_id)\s*=\s*['"]akia[^'"]+['"]""", "Hardcoded AWS access key"),
+]
+_SECRET_RULES = tuple((re.compile(pattern), label) for pattern, label in _SECRET_RULE_SOURCES)
+_SECRET_RULES_FOLDED = tuple((re.compile(pattern, re.IGNORECASE), label) for pattern, label in _SECRET_RULE_SOURCES)
+
+# Every rule needs an `=` and one of these (matched against the lowercased
+# line, so again only trusted on ASCII lines)
+_SECRET_ANCHORS = ("passw", "pwd", "api", "secret", "token", "aws_access_key_id")
+
+
+def check_hardcoded_secrets(ctx, candidates=None):
     """Detect hardcoded passwords, API keys, and tokens."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    patterns = [
-        (r"""(?:password|passwd|pwd)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded password"),
-        (r"""(?:api_key|apikey|api_secret)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded API key"),
-        (r"""(?:secret|secret_key)\s*=\s*['"][^'"]{4,}['"]""", "Hardcoded secret"),
-        (r"""(?:token|access_token|auth_token)\s*=\s*['"][^'"]{8,}['"]""", "Hardcoded token"),
-        (r"""(?:aws_access_key_id)\s*=\s*['"]AKIA[^'"]+['"]""", "Hardcoded AWS access key"),
-    ]
-    for i, line in enumerate(lines, 1):
+    for i, line in _iter_lines(lines, candidates):
+        if "=" not in line:
+            continue
+        if line.isascii():
+            line = line.lower()
+            if not any(anchor in line for anchor in _SECRET_ANCHORS):
+                continue
+            rules = _SECRET_RULES
+        else:
+            rules = _SECRET_RULES_FOLDED
         stripped = line.strip()
         if stripped.startswith("#") or stripped.startswith("//"):
             continue
-        for pattern, label in patterns:
-            if re.search(pattern, stripped, re.IGNORECASE):
+        for pattern, label in rules:
+            if pattern.search(stripped):
                 findings.append(Finding(
                     file=filepath, line=i, level=3, severity="error",
                     check="hardcoded_secret",
@@ -500,30 +803,48 @@ def check_hardcoded_secrets(filepath, lines):
     return findings
 
 
-def check_timing_attack(filepath, lines):
+_RE_RANGE_LEN_LOOP = re.compile(r"for\s+\w+\s+in\s+range\s*\(\s*len\s*\(")
+# The rest of a compare function's `def` is just "a `(` somewhere after" —
+# tested with find(), as a trailing `.*\(` backtracks quadratically
+_RE_COMPARE_DEF = re.compile(r"def\s+\w*(?:compare|equal|eq|const)", re.IGNORECASE)
+_RE_LEN_MISMATCH = re.compile(r"if\s+len\s*\(.+\)\s*!=\s*len")
+
+
+def check_timing_attack(ctx):
     """Detect hand-rolled constant-time comparison functions."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    full_text = "\n".join(lines)
+    full_text = ctx.text
 
     # Pattern: XOR accumulation loop for byte comparison
-    if re.search(r"for\s+\w+\s+in\s+range\s*\(\s*len\s*\(", full_text):
-        for i, line in enumerate(lines, 1):
-            if re.search(r"\|=.*\^", line) or re.search(r"\^=", line):
+    if _RE_RANGE_LEN_LOOP.search(full_text):
+        # Both XOR patterns need a `^`, so only those lines are tried
+        for i in ctx.lines_containing(("^",)):
+            line = lines[i - 1]
+            # `|=` with a `^` after it, or `^=` — plain find()s, as `\|=.*\^`
+            # backtracks quadratically on a line of repeated `|=`
+            accumulate = line.find("|=")
+            if (accumulate != -1 and line.find("^", accumulate + 2) != -1) or "^=" in line:
                 findings.append(Finding(
                     file=filepath, line=i, level=3, severity="error",
                     check="timing_attack",
                     message="Hand-rolled byte comparison with XOR — vulnerable to timing attacks. Use hmac.compare_digest() instead."
                 ))
 
-    # Early return on length mismatch in comparison function
+    # Early return on length mismatch in comparison function. A line that
+    # matches on its own matches in the joined text too, so one search
+    # there rules out most files before walking their functions.
+    if not _RE_LEN_MISMATCH.search(full_text):
+        return findings
     in_compare_func = False
     for i, line in enumerate(lines, 1):
-        if re.search(r"def\s+\w*(compare|equal|eq|const).*\(", line, re.IGNORECASE):
+        compare_def = _RE_COMPARE_DEF.search(line)
+        if compare_def and line.find("(", compare_def.end()) != -1:
             in_compare_func = True
         elif in_compare_func and line.strip().startswith("def "):
             in_compare_func = False
-        if in_compare_func and re.search(r"if\s+len\s*\(.+\)\s*!=\s*len", line):
-            # Check if next line is return False
+        if in_compare_func and _RE_LEN_MISMATCH.search(line):
+            # Check if next line is return False (`i` is 1-based, so lines[i] is the next one)
             if i < len(lines) and "return False" in lines[i]:
                 findings.append(Finding(
                     file=filepath, line=i, level=3, severity="error",
@@ -534,21 +855,28 @@ def check_timing_attack(filepath, lines):
     return findings
 
 
-def check_insecure_deserialization(filepath, lines):
+_DESER_RULES = tuple((re.compile(pattern), msg) for pattern, msg in [
+    (r"\bpickle\.loads?\s*\(", "pickle.load() can execute arbitrary code. Use JSON or validate input."),
+    (r"\byaml\.load\s*\((?!.*Loader\s*=\s*yaml\.SafeLoader)", "yaml.load() without SafeLoader can execute arbitrary code. Use yaml.safe_load()."),
+    (r"\byaml\.unsafe_load\s*\(", "yaml.unsafe_load() can execute arbitrary code. Use yaml.safe_load()."),
+    (r"\bmarshal\.loads?\s*\(", "marshal.load() can execute arbitrary code."),
+])
+
+_DESER_ANCHORS = ("pickle.load", "yaml.", "marshal.load")
+
+
+def check_insecure_deserialization(ctx, candidates=None):
     """Detect unsafe deserialization."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    patterns = [
-        (r"\bpickle\.loads?\s*\(", "pickle.load() can execute arbitrary code. Use JSON or validate input."),
-        (r"\byaml\.load\s*\((?!.*Loader\s*=\s*yaml\.SafeLoader)", "yaml.load() without SafeLoader can execute arbitrary code. Use yaml.safe_load()."),
-        (r"\byaml\.unsafe_load\s*\(", "yaml.unsafe_load() can execute arbitrary code. Use yaml.safe_load()."),
-        (r"\bmarshal\.loads?\s*\(", "marshal.load() can execute arbitrary code."),
-    ]
-    for i, line in enumerate(lines, 1):
+    if candidates is None:
+        candidates = ctx.lines_containing(_DESER_ANCHORS)
+    for i, line in _iter_lines(lines, candidates):
         stripped = line.strip()
         if stripped.startswith("#") or stripped.startswith("//"):
             continue
-        for pattern, msg in patterns:
-            if re.search(pattern, stripped):
+        for pattern, msg in _DESER_RULES:
+            if pattern.search(stripped):
                 findings.append(Finding(
                     file=filepath, line=i, level=3, severity="error",
                     check="insecure_deser", message=msg
@@ -560,25 +888,66 @@ def check_insecure_deserialization(filepath, lines):
 # Level 4 — AI Safety Checks
 # ============================================================
 
-def check_prompt_injection(filepath, lines):
+_PROMPT_INJECTION_PHRASES = [
+    r"ignore\s+(all\s+)?previous\s+instructions",
+    r"you\s+are\s+now\s+a",
+    r"disregard\s+(all\s+)?(above|prior|previous)",
+    r"forget\s+(everything|all|your)\s+(above|instructions|rules)",
+    r"new\s+instructions?\s*:",
+    r"system\s*:\s*you\s+are",
+    r"act\s+as\s+(if\s+you\s+are\s+)?a",
+    r"pretend\s+(to\s+be|you\s+are)",
+    r"do\s+not\s+follow\s+(the\s+)?(above|previous|prior)",
+    r"override\s+(system|instructions|rules)",
+]
+_RE_PROMPT_INJECTION = re.compile("|".join(_PROMPT_INJECTION_PHRASES), re.IGNORECASE)
+
+# Every phrase holds one of these words (its rarest) — a lowercased line
+# without any can't match. Like the secret anchors, only trusted on ASCII.
+_PROMPT_INJECTION_ATOMS = ("instruction", "now", "disregard", "forget", "system", "act",
+                           "pretend", "follow", "override")
+
+
+def _build_prompt_injection_automaton():
+    automaton = ahocorasick.Automaton()
+    for atom in _PROMPT_INJECTION_ATOMS:
+        automaton.add_word(atom, atom)
+    automaton.make_automaton()
+    return automaton
+
+
+# One Aho–Corasick pass finds every atom at once
+_PROMPT_INJECTION_AUTOMATON = _build_prompt_injection_automaton() if ahocorasick else None
+
+
+def _prompt_injection_candidates(ctx):
+    """Numbers of the lines the phrase regex needs to see."""
+    lines = ctx.lines
+    text = ctx.text
+    if text.isascii():
+        lowered = text.lower()
+        if _PROMPT_INJECTION_AUTOMATON is None:
+            return ctx.lines_containing(_PROMPT_INJECTION_ATOMS, lowered)
+        starts = ctx.line_starts
+        return sorted({bisect.bisect_right(starts, end)
+                       for end, _ in _PROMPT_INJECTION_AUTOMATON.iter(lowered)})
+
+    if _PROMPT_INJECTION_AUTOMATON is None:
+        has_atom = lambda lowered: any(atom in lowered for atom in _PROMPT_INJECTION_ATOMS)
+    else:
+        has_atom = lambda lowered: next(_PROMPT_INJECTION_AUTOMATON.iter(lowered), None) is not None
+    return [i for i, line in enumerate(lines, 1) if not line.isascii() or has_atom(line.lower())]
+
+
+def check_prompt_injection(ctx, candidates=None):
     """Detect potential prompt injections hidden in code/comments."""
+    filepath, lines = ctx.filepath, ctx.lines
+    if candidates is None:
+        candidates = _prompt_injection_candidates(ctx)
     findings = []
-    suspicious_phrases = [
-        r"ignore\s+(all\s+)?previous\s+instructions",
-        r"you\s+are\s+now\s+a",
-        r"disregard\s+(all\s+)?(above|prior|previous)",
-        r"forget\s+(everything|all|your)\s+(above|instructions|rules)",
-        r"new\s+instructions?\s*:",
-        r"system\s*:\s*you\s+are",
-        r"act\s+as\s+(if\s+you\s+are\s+)?a",
-        r"pretend\s+(to\s+be|you\s+are)",
-        r"do\s+not\s+follow\s+(the\s+)?(above|previous|prior)",
-        r"override\s+(system|instructions|rules)",
-    ]
-    pattern = re.compile("|".join(suspicious_phrases), re.IGNORECASE)
-
-    for i, line in enumerate(lines, 1):
-        if pattern.search(line):
+    search = _RE_PROMPT_INJECTION.search
+    for i, line in _iter_lines(lines, candidates):
+        if search(line):
             findings.append(Finding(
                 file=filepath, line=i, level=4, severity="error",
                 check="prompt_injection",
@@ -587,23 +956,42 @@ def check_prompt_injection(filepath, lines):
     return findings
 
 
-def check_suspicious_encoded(filepath, lines):
+_RE_B64_LITERAL = re.compile(r'["\']([A-Za-z0-9+/]{40,}={0,2})["\']')
+_B64_MIN_LINE = 42  # two quotes around at least 40 base64 characters
+_RE_READABLE_TEXT = re.compile(r"[a-zA-Z\s]{20,}")
+
+# Decoding is the expensive part — a data file full of base64 blobs stops here
+MAX_B64_DECODES = 32
+
+
+def check_suspicious_encoded(ctx, candidates=None):
     """Detect base64 or hex-encoded strings that might hide instructions."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    b64_pattern = re.compile(r'["\']([A-Za-z0-9+/]{40,}={0,2})["\']')
-
-    for i, line in enumerate(lines, 1):
+    decodes = 0
+    for i, line in _iter_lines(lines, candidates):
+        # Most lines are too short or hold no quote — skip them before any regex
+        if len(line) < _B64_MIN_LINE or ('"' not in line and "'" not in line):
+            continue
         stripped = line.strip()
         if stripped.startswith("#") or stripped.startswith("//"):
             continue
 
-        match = b64_pattern.search(stripped)
+        match = _RE_B64_LITERAL.search(stripped)
         if match:
+            if decodes == MAX_B64_DECODES:
+                findings.append(Finding(
+                    file=filepath, line=i, level=4, severity="info",
+                    check="findings_capped",
+                    message=f"Stopped decoding base64 after {MAX_B64_DECODES} strings — the rest of the file wasn't checked."
+                ))
+                break
+            decodes += 1
             encoded = match.group(1)
             try:
                 decoded = base64.b64decode(encoded).decode("utf-8", errors="replace")
                 # Check if decoded content looks like text/instructions
-                if re.search(r"[a-zA-Z\s]{20,}", decoded):
+                if _RE_READABLE_TEXT.search(decoded):
                     preview = decoded[:60].replace("\n", " ")
                     findings.append(Finding(
                         file=filepath, line=i, level=4, severity="warning",
@@ -615,20 +1003,59 @@ def check_suspicious_encoded(filepath, lines):
     return findings
 
 
-def check_unusual_comments(filepath, lines):
+# Every rule starts with the comment marker, written once here
+_COMMENT_START = r"#\s*"
+_COMMAND_COMMENT_BODIES = [
+    (r"(run|execute|call|invoke|trigger|send|post|delete|drop)\s+", "Comment reads like a command"),
+    (r"\$\s*\w+", "Comment contains shell-style variable"),
+    (r"(curl|wget|ssh|scp|rm\s+-rf)\s+", "Comment contains shell command"),
+]
+# Lowercase, like the secret rules: ASCII lines are searched lowercased
+# with these, any other line with the IGNORECASE twins
+_COMMAND_COMMENT_RULES = tuple(
+    (re.compile(_COMMENT_START + body), label) for body, label in _COMMAND_COMMENT_BODIES
+)
+_COMMAND_COMMENT_RULES_FOLDED = tuple(
+    (re.compile(pattern.pattern, re.IGNORECASE), label) for pattern, label in _COMMAND_COMMENT_RULES
+)
+
+# All the rules as one alternation behind the shared prefix: one search
+# rejects a line, and on a hit group `r<i>` names the rule that matched.
+# (Rules without a common literal prefix are faster searched one by one —
+# a bare alternation loses re's prefix scan.)
+_COMMAND_COMMENT_ANY = re.compile(
+    _COMMENT_START + "(?:" + "|".join(
+        f"(?P<r{i}>{body})" for i, (body, _) in enumerate(_COMMAND_COMMENT_BODIES)
+    ) + ")"
+)
+_COMMAND_COMMENT_ANY_FOLDED = re.compile(_COMMAND_COMMENT_ANY.pattern, re.IGNORECASE)
+
+# Common dev comments that read like commands but aren't worth flagging
+_DEV_COMMENTS = ("# run tests", "# run the", "# execute the", "# call the")
+
+
+def check_unusual_comments(ctx, candidates=None):
     """Detect comments that look like commands rather than documentation."""
+    filepath, lines = ctx.filepath, ctx.lines
     findings = []
-    command_patterns = [
-        (r"#\s*(run|execute|call|invoke|trigger|send|post|delete|drop)\s+", "Comment reads like a command"),
-        (r"#\s*\$\s*\w+", "Comment contains shell-style variable"),
-        (r"#\s*(curl|wget|ssh|scp|rm\s+-rf)\s+", "Comment contains shell command"),
-    ]
-    for i, line in enumerate(lines, 1):
+    for i, line in _iter_lines(lines, candidates):
+        if "#" not in line:
+            continue
         stripped = line.strip()
-        for pattern, label in command_patterns:
-            if re.search(pattern, stripped, re.IGNORECASE):
+        if stripped.isascii():
+            stripped = stripped.lower()
+            any_rule, rules = _COMMAND_COMMENT_ANY, _COMMAND_COMMENT_RULES
+        else:
+            any_rule, rules = _COMMAND_COMMENT_ANY_FOLDED, _COMMAND_COMMENT_RULES_FOLDED
+        m = any_rule.search(stripped)
+        if m is None:
+            continue
+        hit = int(m.lastgroup[1:])
+        for n, (pattern, label) in enumerate(rules):
+            # Several rules can fire on one line — only the matched one is known
+            if n == hit or pattern.search(stripped):
                 # Don't flag common dev comments
-                if any(skip in stripped.lower() for skip in ["# run tests", "# run the", "# execute the", "# call the"]):
+                if any(skip in stripped.lower() for skip in _DEV_COMMENTS):
                     continue
                 findings.append(Finding(
                     file=filepath, line=i, level=4, severity="info",
@@ -642,86 +1069,736 @@ def check_unusual_comments(filepath, lines):
 # Scanner — runs all checks
 # ============================================================
 
-# All checks organized by level
+# All checks organized by level (plus the fused line scan for levels 1–2).
+# Only the requested levels' checks ever run.
 ALL_CHECKS = {
-    1: [check_file_type, check_typos, check_todo_fixme, check_naming_consistency, check_unused_imports],
-    2: [check_bare_except, check_mutable_defaults, check_equality_issues, check_comparison_pitfalls, check_bracket_mismatch, check_assignment_comparison],
+    1: [check_file_type, check_typos, check_unused_imports],
+    2: [check_equality_issues, check_bracket_mismatch],
     3: [check_command_injection, check_hardcoded_secrets, check_timing_attack, check_insecure_deserialization],
     4: [check_prompt_injection, check_suspicious_encoded, check_unusual_comments],
 }
 
-SUPPORTED_EXTS = {".py", ".rs", ".js", ".ts", ".c", ".h", ".go", ".rb", ".java", ".toml", ".md", ".txt"}
+SUPPORTED_EXTS = frozenset({".py", ".rs", ".js", ".ts", ".c", ".h", ".go", ".rb", ".java", ".toml", ".md", ".txt"})
+
+# Byte strings at least one of which must appear in a file for the check to
+# report anything. Looked up in the raw bytes before decoding, so a check is
+# skipped outright on files that can't trigger it. ASCII bytes survive the
+# lossy UTF-8 decode unchanged, so this never hides a finding.
+_FILE_ANCHORS = {
+    check_unused_imports: (b"import",),
+    check_equality_issues: (b"def __eq__",),
+    check_command_injection: tuple(anchor.encode() for anchor in _CMD_ANCHORS),
+    check_timing_attack: (b"len",),
+    check_insecure_deserialization: tuple(anchor.encode() for anchor in _DESER_ANCHORS),
+    check_unusual_comments: (b"#",),
+}
+
+
+# ============================================================
+# Hyperscan prefilter (optional)
+# ============================================================
+#
+# When hyperscan is installed, one block-mode scan over the whole file
+# finds the lines where any of the regex checks below could fire. Those
+# checks then only visit the candidate lines, re-confirming each hit with
+# their `re` patterns so results match the pure-Python path exactly.
+# Patterns are compiled in prefilter mode, which over-approximates
+# constructs hyperscan can't model (lookaheads, lazy quantifiers). A check
+# whose patterns hyperscan rejects outright just runs on every line.
+# A database is built per level set, holding only the requested levels' patterns.
+
+_HS_FAMILIES = [
+    # (check, level, [(pattern, caseless)]) — the fused scan is filtered per group below
+    (_scan_lines, None, [(pat, 0) for _, pat in CHECKS_L1_L2]),
+    (check_command_injection, 3, [(pat.pattern, 0) for pat, _ in _CMD_INJECTION_RULES]),
+    (check_hardcoded_secrets, 3, [(pat.pattern, 1) for pat, _ in _SECRET_RULES]),
+    (check_insecure_deserialization, 3, [(pat.pattern, 0) for pat, _ in _DESER_RULES]),
+    (check_prompt_injection, 4, [(pat, 1) for pat in _PROMPT_INJECTION_PHRASES]),
+    (check_suspicious_encoded, 4, [(_RE_B64_LITERAL.pattern, 0)]),
+    (check_unusual_comments, 4, [(pat.pattern, 1) for pat, _ in _COMMAND_COMMENT_RULES]),
+]
+
+# Where hyperscan's syntax means less than re's, so the prefilter would
+# miss lines: its \s lacks \x1c-\x1f, its \w and \b follow an older
+# Unicode, and caseless i doesn't match İ/ı as re.IGNORECASE does.
+# (\w becomes \S, a superset. The patterns only use i/I as literals.)
+_RE_HS_CASELESS_I = re.compile(r"(?<!\(\?)[iI]")
+
+
+def _hs_expression(pattern, caseless):
+    """Loosen an `re` pattern so hyperscan only ever over-approximates it."""
+    expr = pattern.replace(r"\b", "").replace(r"\w", r"\S").replace(r"\s", r"[\s\x1c-\x1f]")
+    if caseless or "(?i" in pattern:
+        expr = _RE_HS_CASELESS_I.sub(r"[iI\\x{130}\\x{131}]", expr)
+    return expr.encode()
+
+
+def _hs_compile(patterns, flags):
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    db.compile(expressions=patterns, ids=list(range(len(patterns))), elements=len(patterns), flags=flags)
+    return db
+
+
+@lru_cache(maxsize=None)
+def _hs_database(levels):
+    """Compile the prefilter for `levels`.
+
+    Returns:
+        (database, pattern id → family index, families), or None if no check needs it
+    """
+    families = []
+    for check_fn, level, patterns in _HS_FAMILIES:
+        if check_fn is _scan_lines:
+            if not _LINE_SCAN_LEVELS.intersection(levels):
+                continue
+            patterns = [(pat, caseless) for (name, _), (pat, caseless) in zip(CHECKS_L1_L2, patterns)
+                        if _line_group_wanted(name, levels)]
+        elif level not in levels:
+            continue
+
+        base = (hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_MULTILINE
+                | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        families.append((check_fn, [
+            (_hs_expression(pat, caseless), base | (hyperscan.HS_FLAG_CASELESS if caseless else 0))
+            for pat, caseless in patterns
+        ]))
+
+    try:
+        return _hs_compile_families(families)
+    except hyperscan.error:
+        # Some pattern uses syntax hyperscan rejects — leave those checks to `re` alone
+        families = [family for family in families if _hs_compiles(family)]
+        return _hs_compile_families(families)
+
+
+def _hs_compiles(family):
+    try:
+        _hs_compile([expr for expr, _ in family[1]], [flags for _, flags in family[1]])
+    except hyperscan.error:
+        return False
+    return True
+
+
+def _hs_compile_families(families):
+    if not families:
+        return None
+    expressions, flags, family_of = [], [], []
+    for family, (_, compiled) in enumerate(families):
+        for expr, expr_flags in compiled:
+            expressions.append(expr)
+            flags.append(expr_flags)
+            family_of.append(family)
+    return _hs_compile(expressions, flags), family_of, families
+
+
+def hs_scan_file(ctx, levels):
+    """Scan a file's lines with hyperscan in one pass.
+
+    Args:
+        ctx: The file's ScanContext. `ctx.data` (the raw bytes) is scanned
+            as-is only when it's ASCII with plain LF line endings; otherwise
+            `ctx.text` is encoded and scanned instead
+        levels: Calibration levels being run
+
+    Returns:
+        Dict of check function → sorted list of candidate line numbers
+    """
+    compiled = _hs_database(tuple(levels))
+    if compiled is None:
+        return {}
+    db, family_of, families = compiled
+
+    # Raw ASCII bytes split into exactly `lines` (a trailing newline only
+    # adds an empty tail), so line numbers agree with the decoded text
+    data = ctx.data
+    if not (isinstance(data, bytes) and data.isascii() and b"\r" not in data):
+        data = ctx.text.encode("utf-8", "replace")
+    hits = []
+
+    def on_match(pattern_id, start, end, flags, context):
+        hits.append((end - 1, family_of[pattern_id]))
+
+    db.scan(data, match_event_handler=on_match)
+
+    # Number each hit by the newlines before its last byte, counting
+    # in C between consecutive hits rather than indexing every line
+    found = [set() for _ in families]
+    line, pos = 1, 0
+    count = data.count
+    for offset, family in sorted(hits):
+        line += count(b"\n", pos, offset)
+        pos = offset
+        found[family].add(line)
+    return {check_fn: sorted(lines_hit) for (check_fn, _), lines_hit in zip(families, found)}
+
+
+# Longest one check may spend on one file, in seconds — the files are
+# untrusted, and a pathological one could otherwise stall a regex for ages
+CHECK_TIMEOUT = 2.0
+
+
+class _CheckTimeout(BaseException):
+    # Not an Exception, like KeyboardInterrupt: a check's own `except Exception`
+    # (e.g. around b64decode) must not swallow the one alarm it gets
+    pass
+
+
+def _on_check_timeout(signum, frame):
+    raise _CheckTimeout
+
+
+def _can_time_out():
+    # SIGALRM is POSIX-only and only ever delivered to the main thread —
+    # pool workers qualify, the web server's request threads don't
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def _run_checks(ctx, plan):
+    """Run each (check, level, args, candidates) in `plan` and collect their findings.
+
+    One try covers the whole file: a check that raises becomes a
+    scanner_error finding, one cut off after CHECK_TIMEOUT seconds (where
+    SIGALRM is available) a scanner_timeout finding, and the loop resumes
+    with the next check. `candidates` (hyperscan line hits) is only passed
+    to checks that take it.
+    """
+    findings = []
+    watchdog = _can_time_out()
+    if watchdog:
+        previous = signal.signal(signal.SIGALRM, _on_check_timeout)
+    done = 0  # checks started — the last one started is the one that failed
+    try:
+        while done < len(plan):
+            try:
+                for check_fn, level, args, candidates in plan[done:]:
+                    done += 1
+                    if watchdog:
+                        signal.setitimer(signal.ITIMER_REAL, CHECK_TIMEOUT)
+                    if candidates is not None:
+                        findings.extend(check_fn(ctx, *args, candidates=candidates))
+                    else:
+                        findings.extend(check_fn(ctx, *args))
+                if watchdog:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            except _CheckTimeout:
+                check_fn, level = plan[done - 1][:2]
+                findings.append(Finding(
+                    file=ctx.filepath, line=0, level=level, severity="info",
+                    check="scanner_timeout",
+                    message=f"Check {check_fn.__name__} gave up after {CHECK_TIMEOUT:g}s — its results for this file are incomplete."
+                ))
+            except Exception as e:
+                check_fn, level = plan[done - 1][:2]
+                findings.append(Finding(
+                    file=ctx.filepath, line=0, level=level, severity="info",
+                    check="scanner_error",
+                    message=f"Check {check_fn.__name__} failed: {e}"
+                ))
+    finally:
+        if watchdog:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return findings
+
+
+def _normalize_levels(levels):
+    """Sorted, de-duplicated levels (default: [1, 2]), so each check runs at most once."""
+    if levels is None:
+        return [1, 2]
+    return sorted(set(levels))
+
+
+def _split_lines(text):
+    """Split decoded text into lines the way text-mode reading does (universal newlines)."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+# ============================================================
+# Early rejects — files not worth running the checks on
+# ============================================================
+
+def _env_limit(name, default):
+    """Read a limit from env var `name`, falling back to `default` if it's unset or malformed."""
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        value = -1
+    if value < 0:
+        _log.warning("Ignoring %s=%r (not a non-negative integer), using %d", name, raw, default)
+        return default
+    return value
+
 
+# Bigger files are bundles or dumps, not source (BEEBYTES_MAX_BYTES, 0 = no limit)
+MAX_FILE_BYTES = _env_limit("BEEBYTES_MAX_BYTES", 1_000_000)
+MAX_LINE_LENGTH = 5000          # a line this long means minified/generated code
+# Findings kept per check per file — past this it's noise (BEEBYTES_MAX, 0 = no limit)
+MAX_FINDINGS = _env_limit("BEEBYTES_MAX", 50)
+BINARY_SNIFF_BYTES = 4096       # a NUL byte in this prefix means binary
+SKIP_SUFFIXES = (".min.js", ".min.css", "-lock.json", ".map")
+# Lockfiles — generated, often huge, and full of hashes the secret and base64 checks trip on
+SKIP_BASENAMES = frozenset({
+    "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock", "Cargo.lock",
+    "Gemfile.lock", "composer.lock", "go.sum",
+})
 
-def scan_file(filepath, levels=None):
+# Files bigger than this are memory-mapped rather than read into a bytes object
+MMAP_THRESHOLD = 256 * 1024
+
+
+@lru_cache(maxsize=None)
+def _long_line_pattern(max_line_length):
+    # Anchored at line starts, so each line is tried once — linear in the file size.
+    # Lines end at \r as well as \n, as _split_lines (universal newlines) has them.
+    return re.compile(rb"(?:^|(?<=\r))[^\r\n]{%d}" % (max_line_length + 1), re.MULTILINE)
+
+
+def _skipped(filepath, levels, check, message):
+    """A single info finding explaining why a file wasn't scanned."""
+    return [Finding(
+        file=filepath, line=1, level=min(levels, default=1), severity="info",
+        check=check, message=message
+    )]
+
+
+def _is_generated(filepath):
+    return filepath.endswith(SKIP_SUFFIXES) or os.path.basename(filepath) in SKIP_BASENAMES
+
+
+def _skipped_generated(filepath, levels):
+    return _skipped(filepath, levels, "skipped_generated",
+                    "Skipped: generated file (minified bundle, lockfile or source map)")
+
+
+def _skipped_large(filepath, levels, size, max_file_bytes):
+    return _skipped(filepath, levels, "skipped_large",
+                    f"Skipped: file is {size:,} bytes (limit {max_file_bytes:,})")
+
+
+def scan_file(filepath, levels=None, max_file_bytes=None, max_line_length=None, max_findings=None):
     """Scan a single file at the given calibration levels.
 
+    Large, binary and minified files are skipped with a `skipped_*` info
+    finding instead — the regexes would spend seconds on them for nothing.
+    A file whose stat() hasn't changed since it was last scanned is served
+    from the cache without being read.
+
     Args:
         filepath: Path to the file
         levels: List of levels to run (default: [1, 2])
+        max_file_bytes: Skip files larger than this (default: MAX_FILE_BYTES, 0 = no limit)
+        max_line_length: Skip files with a longer line (default: MAX_LINE_LENGTH, 0 = no limit)
+        max_findings: Findings kept per check (default: MAX_FINDINGS, 0 = no limit)
 
     Returns:
         List of Finding objects
     """
-    if levels is None:
-        levels = [1, 2]
+    levels = _normalize_levels(levels)
+    if max_file_bytes is None:
+        max_file_bytes = MAX_FILE_BYTES
+    if max_line_length is None:
+        max_line_length = MAX_LINE_LENGTH
+    if max_findings is None:
+        max_findings = MAX_FINDINGS
+
+    if _is_generated(filepath):
+        return _skipped_generated(filepath, levels)
 
     try:
-        with open(filepath, "r", errors="replace") as f:
-            lines = f.readlines()
+        f = open(filepath, "rb")
     except Exception:
         return []
+    with f:
+        try:
+            # Check the size before reading so huge files never get loaded
+            st = os.fstat(f.fileno())
+        except Exception:
+            return []
+        size = st.st_size
+        if max_file_bytes and size > max_file_bytes:
+            return _skipped_large(filepath, levels, size, max_file_bytes)
+
+        # Kept out of the catch-alls — a cache failure must not read as "no findings"
+        digest = scanner_cache.known_digest(filepath, st, max_line_length)
+        if digest is not None:
+            cached = scanner_cache.get(_cache_key(filepath, levels, max_findings, digest))
+            if cached is not None:
+                return [Finding(filepath, *row) for row in cached]
+
+        try:
+            if size <= MMAP_THRESHOLD:
+                data = f.read()
+            else:
+                # Scan big files straight out of the page cache instead of copying them
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            return []
 
-    # Strip newlines for processing but keep them for line counting
-    lines = [line.rstrip("\n") for line in lines]
+    try:
+        return _scan_data(filepath, data, levels, max_file_bytes, max_line_length, max_findings, st, digest)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+
+def scan_bytes(filepath, data, levels=None, max_file_bytes=None, max_line_length=None, max_findings=None):
+    """Scan file contents that are already in memory (e.g. an upload).
+
+    Args:
+        filepath: Path reported in findings (needn't exist on disk) — its extension picks language-specific checks
+        data: Raw file contents — bytes, or an mmap of the file
+        levels: List of levels to run (default: [1, 2])
+        max_file_bytes: Skip data larger than this (default: MAX_FILE_BYTES, 0 = no limit)
+        max_line_length: Skip data with a longer line (default: MAX_LINE_LENGTH, 0 = no limit)
+        max_findings: Findings kept per check (default: MAX_FINDINGS, 0 = no limit)
+
+    Returns:
+        List of Finding objects
+    """
+    levels = _normalize_levels(levels)
+    if max_file_bytes is None:
+        max_file_bytes = MAX_FILE_BYTES
+    if max_line_length is None:
+        max_line_length = MAX_LINE_LENGTH
+    if max_findings is None:
+        max_findings = MAX_FINDINGS
+
+    if _is_generated(filepath):
+        return _skipped_generated(filepath, levels)
+    return _scan_data(filepath, data, levels, max_file_bytes, max_line_length, max_findings)
+
+
+def _cache_key(filepath, levels, max_findings, digest):
+    # Results depend on the bytes, the extension (some checks are .py-only), the levels and the cap
+    return scanner_cache.key_for(digest, SCANNER_VERSION, os.path.splitext(filepath)[1], levels, max_findings)
+
+
+def _cap_findings(findings, max_findings):
+    """Keep the first `max_findings` of each check, plus a note where a check was cut off.
+
+    `findings` must be sorted by line.
+    """
+    if len(findings) <= max_findings:
+        return findings
+    counts = Counter(map(attrgetter("check"), findings))
+    if max(counts.values()) <= max_findings:
+        return findings
+
+    kept = []
+    seen = Counter()
+    for f in findings:
+        seen[f.check] += 1
+        n = seen[f.check]
+        if n <= max_findings:
+            kept.append(f)
+        elif n == max_findings + 1:
+            # The note goes where the first dropped finding was
+            kept.append(Finding(
+                file=f.file, line=f.line, level=f.level, severity="info",
+                check="findings_capped",
+                message=f"{counts[f.check] - max_findings} more {f.check} findings not shown "
+                        f"(limit {max_findings} per check)."
+            ))
+    return kept
+
+
+def _scan_data(filepath, data, levels, max_file_bytes, max_line_length, max_findings, st=None, digest=None):
+    """scan_bytes with its defaults filled in.
+
+    `st` is the file's stat when it came from disk, so its digest can be
+    remembered; `digest` is the remembered one, when still valid.
+    """
+    if max_file_bytes and len(data) > max_file_bytes:
+        return _skipped_large(filepath, levels, len(data), max_file_bytes)
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return _skipped(filepath, levels, "skipped_binary", "Skipped: binary file")
+    if (max_line_length and len(data) > max_line_length
+            and _long_line_pattern(max_line_length).search(data)):
+        return _skipped(filepath, levels, "skipped_minified",
+                        f"Skipped: has a line over {max_line_length:,} characters (minified?)")
+
+    if digest is None:
+        digest = scanner_cache.digest_of(data)
+    if st is not None:
+        scanner_cache.remember_digest(filepath, st, digest, max_line_length)
+    cache_key = _cache_key(filepath, levels, max_findings, digest)
+    cached = scanner_cache.get(cache_key)
+    if cached is not None:
+        return [Finding(filepath, *row) for row in cached]
+
+    ctx = ScanContext(filepath, _split_lines(str(data, "utf-8", errors="replace")), data)
+
+    hits = hs_scan_file(ctx, levels) if hyperscan else {}
+
+    plan = []
+    line_levels = [level for level in levels if level in _LINE_SCAN_LEVELS]
+    if line_levels:
+        plan.append((_scan_lines, line_levels[0], (line_levels,), hits.get(_scan_lines)))
 
-    findings = []
     for level in levels:
-        if level in ALL_CHECKS:
-            for check_fn in ALL_CHECKS[level]:
-                try:
-                    results = check_fn(filepath, lines)
-                    findings.extend(results)
-                except Exception as e:
-                    findings.append(Finding(
-                        file=filepath, line=0, level=level, severity="info",
-                        check="scanner_error",
-                        message=f"Check {check_fn.__name__} failed: {e}"
-                    ))
+        for check_fn in ALL_CHECKS.get(level, ()):
+            anchors = _FILE_ANCHORS.get(check_fn)
+            # find(), not `in` — on an mmap `in` only matches single bytes
+            if anchors and not any(data.find(anchor) != -1 for anchor in anchors):
+                continue
+            plan.append((check_fn, level, (), hits.get(check_fn)))
+
+    findings = _run_checks(ctx, plan)
+
+    # Checks can report the same thing on the same line more than once —
+    # keep the first (every finding here is for the same file)
+    seen = set()
+    unique = []
+    for f in findings:
+        key = (f.line, f.check, f.message)
+        if key not in seen:
+            seen.add(key)
+            unique.append(f)
+    findings = unique
 
     # Sort by line number
-    findings.sort(key=lambda f: (f.file, f.line))
+    findings.sort(key=attrgetter("line"))
+    if max_findings:
+        findings = _cap_findings(findings, max_findings)
+    # Cached as positional rows — the file path is the only field that varies by caller.
+    # A timeout depends on how busy the machine was, so that result isn't kept.
+    if not any(f.check == "scanner_timeout" for f in findings):
+        scanner_cache.put(cache_key, [
+            (f.line, f.level, f.severity, f.check, f.message) for f in findings
+        ])
     return findings
 
 
-def scan_directory(dirpath, levels=None, ext_filter=None):
-    """Scan all files in a directory recursively.
+# SUPPORTED_EXTS in the form str.endswith takes
+_SUPPORTED_SUFFIXES = tuple(sorted(SUPPORTED_EXTS))
+
+# Directories never worth descending into
+SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules", "target", ".venv", "venv", ".tox", "dist", "build",
+                       "vendor", "third_party"})
+
+# Below this many files a process pool costs more to start than it saves
+PARALLEL_MIN_FILES = 32
+
+# Threads listing directories in parallel during the walk
+WALK_THREADS = 8
+
+# Paths the walk may find ahead of the scan before its threads block
+WALK_QUEUE_SIZE = 4096
+
+# Files sent to a worker process per round trip, and chunks in flight per
+# worker — enough to keep every worker busy without queueing the whole walk
+SCAN_CHUNK_FILES = 16
+SCAN_CHUNKS_AHEAD = 4
+
+# Worker processes are kept between scans: the web UI runs many scans per
+# session, and each worker keeps its compiled patterns and cache connection
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def _process_pool(workers):
+    """Return the shared pool, replacing it if a different size is asked for."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+        return _pool
+
+
+def _discard_pool(pool):
+    """Drop `pool` after a worker died, so the next scan starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _walk_parallel(root, allowed_exts, skip_dirs, threads=WALK_THREADS):
+    """Yield paths of matching files under `root`, listing directories on a thread pool.
+
+    Port of TensorFlow's parallel gfile walk: workers pop directories off a
+    shared LIFO stack, list them, push subdirectories back and emit files as
+    they go. Overlapping the listing syscalls matters on network mounts and
+    cold caches. Like os.walk, symlinked directories are not followed.
+
+    `allowed_exts` is a tuple of suffixes, matched with str.endswith — one C
+    call per name, measured faster than rfind() plus a set lookup.
+
+    Found paths wait in a bounded queue, so a walk that outpaces the scan
+    pauses instead of buffering the whole tree. If the caller stops early,
+    closing the generator stops the threads.
+    """
+    stack = [root]
+    pending = 1  # directories pushed but not finished listing
+    cond = threading.Condition()
+    # Room for one put per thread after a drain, plus `done`, so no put
+    # can block once `stopped` is set
+    found = queue.Queue(maxsize=max(WALK_QUEUE_SIZE, threads + 1))
+    done = object()
+    stopped = threading.Event()
+
+    def worker():
+        nonlocal pending
+        while True:
+            with cond:
+                while not stack and pending:
+                    cond.wait()
+                if not stack or stopped.is_set():
+                    return
+                dirpath = stack.pop()
+
+            # scandir's DirEntry answers is_dir()/is_file() from the listing
+            # itself, so there's no extra stat per entry. Entries are taken
+            # in readdir order — the threads interleave anyway, and callers
+            # sort the findings.
+            subdirs = []
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in skip_dirs:
+                                subdirs.append(entry.path)
+                        elif entry.name.endswith(allowed_exts) and entry.is_file():
+                            if stopped.is_set():
+                                break
+                            found.put(entry.path)
+            except OSError:
+                pass
+            finally:
+                # Even if this thread dies, the directory counts as finished
+                # so the other workers (and the caller) don't wait on it forever
+                with cond:
+                    stack.extend(subdirs)
+                    pending += len(subdirs) - 1
+                    cond.notify_all()
+
+    pool = [threading.Thread(target=worker, daemon=True) for _ in range(threads)]
+    for t in pool:
+        t.start()
+
+    def close():
+        for t in pool:
+            t.join()
+        found.put(done)
+
+    threading.Thread(target=close, daemon=True).start()
+
+    try:
+        while True:
+            path = found.get()
+            if path is done:
+                return
+            yield path
+    finally:
+        stopped.set()
+        # Unblock any thread stuck on a full queue
+        while True:
+            try:
+                found.get_nowait()
+            except queue.Empty:
+                break
+
+
+def _scan_chunk(paths, levels, limits):
+    """Scan a batch of files in a worker process — one round trip per batch."""
+    return [scan_file(path, levels, **limits) for path in paths]
+
+
+def _scan_pooled(pool, paths, levels, limits, workers):
+    """Yield scan_file results for `paths` from `pool`, in order.
+
+    Unlike Executor.map, which queues every path before returning the
+    first result, only a few chunks per worker are submitted at a time. The
+    walk and the scan overlap, and results stream out as soon as the oldest
+    chunk is done.
+    """
+    scan = partial(_scan_chunk, levels=levels, limits=limits)
+    chunks = iter(lambda: list(itertools.islice(paths, SCAN_CHUNK_FILES)), [])
+    max_in_flight = SCAN_CHUNKS_AHEAD * (workers or os.cpu_count() or 1)
+    in_flight = deque()
+    try:
+        for chunk in chunks:
+            in_flight.append(pool.submit(scan, chunk))
+            while in_flight and (len(in_flight) >= max_in_flight or in_flight[0].done()):
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def iter_directory(dirpath, levels=None, ext_filter=None, workers=None, **limits):
+    """Scan all files in a directory recursively, yielding results file by file.
+
+    Files are independent, so they're scanned across a process pool that
+    starts working while the (threaded) walk is still discovering files.
+    The pool is kept for later scans with the same `workers`.
 
     Args:
         dirpath: Path to directory
         levels: Calibration levels to use (default: [1, 2])
         ext_filter: Optional list of extensions like [".py", ".rs"]
+        workers: Worker processes (default: one per CPU; 1 = scan serially)
+        **limits: max_file_bytes / max_line_length / max_findings, passed on to scan_file
 
-    Returns:
-        List of Finding objects
+    Yields:
+        One non-empty list of Finding objects per file, sorted by line
     """
-    if levels is None:
-        levels = [1, 2]
+    levels = _normalize_levels(levels)
+
+    allowed_exts = tuple(ext_filter) if ext_filter else _SUPPORTED_SUFFIXES
+    paths = _walk_parallel(dirpath, allowed_exts, SKIP_DIRS)
+    try:
+        head = list(itertools.islice(paths, PARALLEL_MIN_FILES))
+
+        if workers == 1 or len(head) < PARALLEL_MIN_FILES:
+            results = map(partial(scan_file, levels=levels, **limits), itertools.chain(head, paths))
+            yield from filter(None, results)
+        else:
+            pool = _process_pool(workers)
+            try:
+                results = _scan_pooled(pool, itertools.chain(head, paths), levels, limits, workers)
+                yield from filter(None, results)
+            except BrokenProcessPool:
+                _discard_pool(pool)
+                raise
+    finally:
+        paths.close()
+
+
+def scan_directory(dirpath, levels=None, ext_filter=None, workers=None, **limits):
+    """Scan all files in a directory recursively.
 
-    allowed_exts = set(ext_filter) if ext_filter else SUPPORTED_EXTS
-    skip_dirs = {".git", "__pycache__", "node_modules", "target", ".venv", "venv", ".tox", "dist", "build"}
+    Args:
+        dirpath: Path to directory
+        levels: Calibration levels to use (default: [1, 2])
+        ext_filter: Optional list of extensions like [".py", ".rs"]
+        workers: Worker processes (default: one per CPU; 1 = scan serially)
+        **limits: max_file_bytes / max_line_length / max_findings, passed on to scan_file
 
+    Returns:
+        (findings, stats) — list of Finding objects and their ScanStats
+    """
     findings = []
-    for root, dirs, files in os.walk(dirpath):
-        dirs[:] = [d for d in dirs if d not in skip_dirs]
-        for fname in sorted(files):
-            fpath = os.path.join(root, fname)
-            ext = Path(fname).suffix
-            if ext in allowed_exts:
-                findings.extend(scan_file(fpath, levels))
-
-    findings.sort(key=lambda f: (f.file, f.line))
-    return findings
+    stats = ScanStats()
+    for file_findings in iter_directory(dirpath, levels, ext_filter, workers, **limits):
+        findings.extend(file_findings)
+        stats.add_file(file_findings)
+    findings.sort(key=finding_sort_key)
+    return findings, stats
 
 
 # ============================================================
@@ -736,6 +1813,9 @@ LEVEL_NAMES = {
 }
 
 
+SEVERITY_ICONS = {"error": "🔴", "warning": "🟡", "info": "🔵"}
+
+
 def build_prompt(findings, base_dir=""):
     """Build a structured prompt from findings that AI agents can act on.
 
@@ -750,24 +1830,23 @@ def build_prompt(findings, base_dir=""):
         return "✅ No issues found at the selected calibration levels."
 
     # Determine which levels were active
-    active_levels = sorted(set(f.level for f in findings))
+    active_levels = sorted({f.level for f in findings})
     level_str = " + ".join(LEVEL_NAMES.get(l, f"L{l}") for l in active_levels)
 
-    # Group by file
-    by_file = {}
-    for f in findings:
-        rel_path = f.file
+    # relpath() is slow — work it out once per file, not once per finding
+    rel_paths = {}
+    for path in {f.file for f in findings}:
+        rel_paths[path] = path
         if base_dir:
             try:
-                rel_path = os.path.relpath(f.file, base_dir)
+                rel_paths[path] = os.path.relpath(path, base_dir)
             except ValueError:
                 pass
-        by_file.setdefault(rel_path, []).append(f)
+    rel_path_of = lambda f: rel_paths[f.file]
 
     # Count stats
-    errors = sum(1 for f in findings if f.severity == "error")
-    warnings = sum(1 for f in findings if f.severity == "warning")
-    infos = sum(1 for f in findings if f.severity == "info")
+    counts = Counter(map(attrgetter("severity"), findings))
+    errors, warnings, infos = counts["error"], counts["warning"], counts["info"]
 
     lines = []
     lines.append("I need you to review and fix the following issues in my codebase.")
@@ -779,11 +1858,12 @@ def build_prompt(findings, base_dir=""):
         lines.append(f"🔴 {errors} errors | 🟡 {warnings} warnings | 🔵 {infos} info")
     lines.append("")
 
-    for filepath, file_findings in sorted(by_file.items()):
+    # Group by file — the sort is stable, so each file keeps its findings' order
+    icon = SEVERITY_ICONS.get
+    for filepath, file_findings in itertools.groupby(sorted(findings, key=rel_path_of), key=rel_path_of):
         lines.append(f"### {filepath}")
-        for f in file_findings:
-            icon = {"error": "🔴", "warning": "🟡", "info": "🔵"}.get(f.severity, "⚪")
-            lines.append(f"- {icon} **Line {f.line}** [{f.check}]: {f.message}")
+        lines.extend([f"- {icon(f.severity, '⚪')} **Line {f.line}** [{f.check}]: {f.message}"
+                      for f in file_findings])
         lines.append("")
 
     return "\n".join(lines)
@@ -809,7 +1889,7 @@ if __name__ == "__main__":
     if os.path.isfile(target):
         findings = scan_file(target, levels)
     else:
-        findings = scan_directory(target, levels)
+        findings, _ = scan_directory(target, levels)
 
     prompt = build_prompt(findings, base_dir=target if os.path.isdir(target) else os.path.dirname(target))
     print(prompt)
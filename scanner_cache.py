@@ -0,0 +1,143 @@
+"""
+Bee Bytez — Scan Cache
+
+Remembers scan results on disk, keyed by a hash of each file's bytes, so
+re-scanning an unchanged tree skips the checks entirely. Each file's hash
+is remembered too, keyed by its stat(), so an untouched file isn't even
+read. The cache is a small SQLite file in the app's __pycache__ folder —
+the same folder the 🗑️ Cache button shows and clears. Nothing ever leaves
+your machine.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # optional — stdlib BLAKE2 is nearly as fast
+    from hashlib import blake2b as _hasher
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+CACHE_PATH = os.path.join(CACHE_DIR, "bee_scan.db")
+
+# Set BEEBYTES_NO_CACHE=1 to always scan from scratch
+ENABLED = not os.environ.get("BEEBYTES_NO_CACHE")
+
+# A file modified this recently could change again within the same mtime
+# tick without its stat changing, so its hash isn't remembered yet
+RACY_WINDOW_NS = 2_000_000_000
+
+# SQLite connections can't cross threads or forked processes
+_local = threading.local()
+
+
+def _connect():
+    """Return this thread's connection, reopening it if the file was cleared.
+
+    Raises sqlite3.Error or OSError if the cache can't be opened (say, the
+    folder is read-only); callers then carry on as if caching were off.
+    """
+    try:
+        inode = os.stat(CACHE_PATH).st_ino
+    except FileNotFoundError:
+        inode = None
+
+    state = getattr(_local, "state", None)
+    if state is not None:
+        conn, pid, conn_inode = state
+        if pid != os.getpid():
+            pass  # inherited across fork — never touch the parent's handle
+        elif inode is not None and inode == conn_inode:
+            return conn
+        else:
+            conn.close()
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(CACHE_PATH, timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS findings (key TEXT PRIMARY KEY, data TEXT NOT NULL)")
+    # line_limit: the file has no line longer than this (0 = unknown)
+    conn.execute("CREATE TABLE IF NOT EXISTS digests (path TEXT PRIMARY KEY, stat TEXT NOT NULL, "
+                 "digest TEXT NOT NULL, line_limit INTEGER NOT NULL)")
+    _local.state = (conn, os.getpid(), os.stat(CACHE_PATH).st_ino)
+    return conn
+
+
+def digest_of(data):
+    """Hash of a file's bytes."""
+    return _hasher(data).hexdigest()
+
+
+def key_for(digest, *parts):
+    """Build a cache key from a file's digest plus anything else the result depends on."""
+    return ":".join([*map(str, parts), digest])
+
+
+def _stat_key(st):
+    # Any write, rename-over or chmod changes at least one of these
+    return f"{st.st_mtime_ns}:{st.st_ctime_ns}:{st.st_size}:{st.st_ino}"
+
+
+def known_digest(path, st, max_line_length):
+    """Return the remembered digest of `path`, or None.
+
+    Only returned if the stat is unchanged and the file is known to pass
+    the `max_line_length` check (0 = no limit) without reading it again.
+    """
+    if not ENABLED:
+        return None
+    try:
+        row = _connect().execute("SELECT stat, digest, line_limit FROM digests WHERE path = ?",
+                                 (os.path.abspath(path),)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None or row[0] != _stat_key(st):
+        return None
+    stat_key, digest, line_limit = row
+    if max_line_length and not (line_limit and line_limit <= max_line_length):
+        return None
+    return digest
+
+
+def remember_digest(path, st, digest, max_line_length):
+    """Remember `path`'s digest for its current stat. Failures are ignored.
+
+    `max_line_length` is the line limit the file just passed (0 = none).
+    """
+    if not ENABLED or time.time_ns() - st.st_mtime_ns < RACY_WINDOW_NS:
+        return
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO digests (path, stat, digest, line_limit) VALUES (?, ?, ?, ?)",
+                         (os.path.abspath(path), _stat_key(st), digest, max_line_length))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def get(key):
+    """Return the cached rows for `key`, or None on a miss."""
+    if not ENABLED:
+        return None
+    try:
+        row = _connect().execute("SELECT data FROM findings WHERE key = ?", (key,)).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def put(key, rows):
+    """Store a list of JSON-able rows under `key`. Failures are ignored."""
+    if not ENABLED:
+        return
+    try:
+        conn = _connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO findings (key, data) VALUES (?, ?)",
+                         (key, json.dumps(rows)))
+    except (sqlite3.Error, OSError):
+        pass
@@ -3,7 +3,9 @@ mod va;
 mod piece;
 mod seeder;
 
+use std::collections::HashMap;
 use std::env;
+use std::io::{self, BufRead, Write};
 use std::path::Path;
 use std::time::Instant;
 
@@ -26,6 +28,237 @@ fn json_escape(s: &str) -> String {
     out
 }
 
+/// Render query results as a single line of JSON (shared by --json-query and --serve).
+fn results_json(query: &str, total_pieces: usize, query_time_us: u128, results: &[seeder::QueryResult]) -> String {
+    let rows: Vec<String> = results.iter().enumerate().map(|(rank, r)| {
+        format!(
+            r#"{{"rank":{},"score":{:.6},"piece_id":{},"start_line":{},"file":"{}","preview":"{}","content":"{}"}}"#,
+            rank + 1, r.score, r.piece_id, r.start_line,
+            json_escape(&r.source), json_escape(&r.preview), json_escape(&r.content)
+        )
+    }).collect();
+    format!(
+        r#"{{"query":"{}","total_pieces":{},"query_time_us":{},"results":[{}]}}"#,
+        json_escape(query), total_pieces, query_time_us, rows.join(",")
+    )
+}
+
+// ---------------------------------------------------------------
+// Serve mode — a long-running process answering one JSON request per line
+// ---------------------------------------------------------------
+
+/// A scalar from a request line. Requests are flat objects, so nested
+/// arrays/objects aren't supported.
+enum JsonValue {
+    Str(String),
+    Num(f64),
+    Other,
+}
+
+/// Minimal JSON reader — just enough for `--serve` request lines.
+struct JsonParser<'a> {
+    chars: std::iter::Peekable<std::str::Chars<'a>>,
+}
+
+impl JsonParser<'_> {
+    fn skip_ws(&mut self) {
+        while matches!(self.chars.peek(), Some(c) if c.is_whitespace()) {
+            self.chars.next();
+        }
+    }
+
+    fn eat(&mut self, c: char) -> bool {
+        if self.chars.peek() == Some(&c) {
+            self.chars.next();
+            true
+        } else {
+            false
+        }
+    }
+
+    fn expect(&mut self, c: char) -> Result<(), String> {
+        if self.eat(c) { Ok(()) } else { Err(format!("expected '{}'", c)) }
+    }
+
+    fn hex4(&mut self) -> Result<u32, String> {
+        let mut code = 0;
+        for _ in 0..4 {
+            let digit = self.chars.next().and_then(|c| c.to_digit(16)).ok_or("bad \\u escape")?;
+            code = code * 16 + digit;
+        }
+        Ok(code)
+    }
+
+    fn string(&mut self) -> Result<String, String> {
+        self.expect('"')?;
+        let mut out = String::new();
+        loop {
+            match self.chars.next() {
+                None => return Err("unterminated string".into()),
+                Some('"') => return Ok(out),
+                Some('\\') => match self.chars.next() {
+                    Some('n') => out.push('\n'),
+                    Some('t') => out.push('\t'),
+                    Some('r') => out.push('\r'),
+                    Some('b') => out.push('\u{8}'),
+                    Some('f') => out.push('\u{c}'),
+                    Some('u') => {
+                        let mut code = self.hex4()?;
+                        if (0xD800..0xDC00).contains(&code) && self.eat('\\') && self.eat('u') {
+                            // UTF-16 surrogate pair
+                            let low = self.hex4()?;
+                            code = 0x10000 + ((code - 0xD800) << 10) + (low.wrapping_sub(0xDC00) & 0x3FF);
+                        }
+                        out.push(char::from_u32(code).unwrap_or('\u{FFFD}'));
+                    }
+                    Some(c) => out.push(c), // \" \\ \/
+                    None => return Err("unterminated string".into()),
+                },
+                Some(c) => out.push(c),
+            }
+        }
+    }
+
+    fn value(&mut self) -> Result<JsonValue, String> {
+        match self.chars.peek() {
+            Some('"') => Ok(JsonValue::Str(self.string()?)),
+            Some(c) if *c == '-' || c.is_ascii_digit() => {
+                let mut num = String::new();
+                while let Some(&c) = self.chars.peek() {
+                    if !(c.is_ascii_digit() || "+-.eE".contains(c)) {
+                        break;
+                    }
+                    num.push(c);
+                    self.chars.next();
+                }
+                num.parse().map(JsonValue::Num).map_err(|_| format!("bad number: {}", num))
+            }
+            Some(_) => {
+                let mut word = String::new();
+                while let Some(&c) = self.chars.peek() {
+                    if !c.is_ascii_alphabetic() {
+                        break;
+                    }
+                    word.push(c);
+                    self.chars.next();
+                }
+                match word.as_str() {
+                    "true" | "false" | "null" => Ok(JsonValue::Other),
+                    _ => Err("unsupported JSON value".into()),
+                }
+            }
+            None => Err("unexpected end of request".into()),
+        }
+    }
+}
+
+/// Parse a flat JSON object like `{"path":"/src","query":"dot product","top":5}`.
+fn parse_request(line: &str) -> Result<HashMap<String, JsonValue>, String> {
+    let mut p = JsonParser { chars: line.trim().chars().peekable() };
+    let mut fields = HashMap::new();
+    p.expect('{')?;
+    p.skip_ws();
+    if p.eat('}') {
+        return Ok(fields);
+    }
+    loop {
+        p.skip_ws();
+        let key = p.string()?;
+        p.skip_ws();
+        p.expect(':')?;
+        p.skip_ws();
+        let value = p.value()?;
+        fields.insert(key, value);
+        p.skip_ws();
+        if !p.eat(',') {
+            p.expect('}')?;
+            return Ok(fields);
+        }
+    }
+}
+
+/// A loaded directory, kept hot between requests.
+struct Index {
+    fingerprint: u64,
+    manager: piece::PieceManager,
+    swarm: seeder::Swarm,
+}
+
+/// Directories a serve process keeps indexed at once
+const MAX_INDEXES: usize = 4;
+
+/// Indexes keyed by (root path, extension filter)
+type IndexCache = HashMap<(String, Option<String>), Index>;
+
+/// Answer one request line: `{"path": ..., "query": ..., "top": 10, "ext": "rs,py"}`.
+fn handle_request(line: &str, indexes: &mut IndexCache) -> Result<String, String> {
+    let req = parse_request(line)?;
+    let path = match req.get("path") {
+        Some(JsonValue::Str(s)) => s.clone(),
+        _ => return Err("missing \"path\"".into()),
+    };
+    let query_text = match req.get("query") {
+        Some(JsonValue::Str(s)) => s.clone(),
+        _ => return Err("missing \"query\"".into()),
+    };
+    let top_k: usize = match req.get("top") {
+        Some(JsonValue::Num(n)) if *n >= 0.0 => *n as usize,
+        Some(JsonValue::Str(s)) => s.parse().unwrap_or(10),
+        _ => 10,
+    };
+    let ext = match req.get("ext") {
+        Some(JsonValue::Str(s)) => Some(s.clone()),
+        _ => None,
+    };
+    let exts: Option<Vec<&str>> = ext.as_deref().map(|e| e.split(',').collect());
+
+    let dir = Path::new(&path);
+    if !dir.exists() {
+        return Err(format!("Path not found: {}", path));
+    }
+
+    // Rebuild only when a file was added, removed or modified since the last query
+    let fingerprint = piece::PieceManager::fingerprint(dir, exts.as_deref());
+    let key = (path.clone(), ext.clone());
+    if indexes.get(&key).map_or(true, |index| index.fingerprint != fingerprint) {
+        if !indexes.contains_key(&key) && indexes.len() >= MAX_INDEXES {
+            if let Some(old) = indexes.keys().next().cloned() {
+                indexes.remove(&old); // dropping the swarm stops its threads
+            }
+        }
+        let start = Instant::now();
+        let manager = piece::PieceManager::from_directory_filtered(dir, exts.as_deref());
+        let swarm = seeder::Swarm::from_pieces(&manager);
+        eprintln!("📦 Indexed {} — {} pieces in {:?}", path, manager.pieces.len(), start.elapsed());
+        indexes.insert(key.clone(), Index { fingerprint, manager, swarm });
+    }
+
+    let index = &indexes[&key];
+    let start = Instant::now();
+    let query_embedding = index.manager.embed_query(&query_text);
+    let results = index.swarm.query(&query_embedding, top_k);
+    let elapsed = start.elapsed();
+    Ok(results_json(&query_text, index.swarm.seeder_count(), elapsed.as_micros(), &results))
+}
+
+/// Read requests from stdin until EOF, writing one JSON reply line per request.
+fn serve() {
+    eprintln!("🐝 Serve mode: one JSON request per line on stdin");
+    let mut indexes = IndexCache::new();
+    let mut stdout = io::stdout().lock();
+    for line in io::stdin().lock().lines() {
+        let Ok(line) = line else { break };
+        if line.trim().is_empty() {
+            continue;
+        }
+        let reply = handle_request(&line, &mut indexes)
+            .unwrap_or_else(|e| format!(r#"{{"error":"{}"}}"#, json_escape(&e)));
+        if writeln!(stdout, "{}", reply).and_then(|_| stdout.flush()).is_err() {
+            break; // parent went away
+        }
+    }
+}
+
 fn main() {
     eprintln!("╔══════════════════════════════════════════════════════════╗");
     eprintln!("║   🐝 BEE BYTEZ — Hive Search Engine (Rust)             ║");
@@ -36,6 +269,11 @@ fn main() {
     // Determine what to load: CLI arg or default to own source
     // ---------------------------------------------------------------
     let args: Vec<String> = env::args().collect();
+    if args.iter().any(|a| a == "--serve") {
+        serve();
+        return;
+    }
+
     let ext_pos = args.iter().position(|a| a == "--ext");
     let ext_filter_str: Option<String> = ext_pos.and_then(|i| args.get(i + 1).cloned());
     let load_dir = args.iter()
@@ -104,27 +342,9 @@ fn main() {
             let elapsed = start.elapsed();
             
             eprintln!("   {} results in {:?}", results.len(), elapsed);
-            
+
             // Output JSON to stdout
-            let json_results: Vec<String> = results.iter().enumerate().map(|(rank, r)| {
-                let source = json_escape(&r.source);
-                let preview = json_escape(&r.preview);
-                let content = json_escape(&r.content);
-                format!(
-                    r#"  {{"rank":{},"score":{:.6},"piece_id":{},"start_line":{},"file":"{}","preview":"{}","content":"{}"}}"#,
-                    rank + 1, r.score, r.piece_id, r.start_line, source, preview, content
-                )
-            }).collect();
-            
-            println!("{{");
-            println!(r#"  "query":"{}","#, json_escape(query_text));
-            println!(r#"  "total_pieces":{},"#, swarm.seeder_count());
-            println!(r#"  "query_time_us":{},"#, elapsed.as_micros());
-            println!(r#"  "results":[{}"#, if json_results.is_empty() { "" } else { "\n" });
-            println!("{}", json_results.join(",\n"));
-            if !json_results.is_empty() { println!("  "); }
-            println!("  ]");
-            println!("}}");
+            println!("{}", results_json(query_text, swarm.seeder_count(), elapsed.as_micros(), &results));
             return;
         }
     }
@@ -115,6 +115,46 @@ impl PieceManager {
         }
     }
 
+    /// Cheap fingerprint of the files `from_directory_filtered` would load.
+    ///
+    /// Walks the same tree but only stats each file (path, size, mtime), so a
+    /// long-running index can tell whether it needs rebuilding without
+    /// re-reading anything. Order-independent: per-file hashes are summed.
+    pub fn fingerprint(dir: &Path, ext_filter: Option<&[&str]>) -> u64 {
+        let mut total = 0u64;
+        Self::fingerprint_dir(dir, ext_filter, &mut total);
+        total
+    }
+
+    fn fingerprint_dir(dir: &Path, ext_filter: Option<&[&str]>, total: &mut u64) {
+        let entries = match fs::read_dir(dir) {
+            Ok(e) => e,
+            Err(_) => return,
+        };
+        let default_exts: &[&str] = &["rs", "toml", "md", "txt", "c", "h", "py", "js", "ts"];
+        let allowed = ext_filter.unwrap_or(default_exts);
+        for entry in entries.flatten() {
+            let path = entry.path();
+            if path.is_dir() {
+                let name = path.file_name().unwrap_or_default().to_string_lossy();
+                if !name.starts_with('.') && name != "target" {
+                    Self::fingerprint_dir(&path, ext_filter, total);
+                }
+            } else if path.is_file() {
+                let ext = path.extension().unwrap_or_default().to_string_lossy();
+                if allowed.iter().any(|a| *a == ext.as_ref()) {
+                    if let Ok(meta) = fs::metadata(&path) {
+                        let mut hasher = DefaultHasher::new();
+                        path.hash(&mut hasher);
+                        meta.len().hash(&mut hasher);
+                        meta.modified().ok().hash(&mut hasher);
+                        *total = total.wrapping_add(hasher.finish());
+                    }
+                }
+            }
+        }
+    }
+
     /// Split content into chunks of approximately `max_lines` lines.
     ///
     /// Returns Vec<(chunk_text, start_line)> where start_line is 1-indexed.
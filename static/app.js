@@ -278,7 +278,7 @@ async function runScan() {
     statusEl.innerHTML = '<span class="status-dot scanning"></span> Scanning...';
 
     try {
-        const response = await fetch(`${API}/api/scan`, {
+        const response = await fetch(`${API}/api/scan/stream`, {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({ path, levels }),
@@ -289,7 +289,22 @@ async function runScan() {
             throw new Error(err.error || "Scan failed");
         }
 
-        const data = await response.json();
+        // Findings arrive one per line while the scan runs; the last line is the summary
+        const findings = [];
+        let summary = null;
+        await readNdjson(response, record => {
+            if (record.done) {
+                summary = record;
+                return;
+            }
+            findings.push(record);
+            if (findings.length % 100 === 0) {
+                statusEl.innerHTML = `<span class="status-dot scanning"></span> Scanning... ${findings.length} findings`;
+            }
+        });
+        if (!summary) throw new Error("Scan ended before it finished");
+
+        const data = { ...summary, findings };
         renderResults(data);
         renderPrompt(data.prompt);
         lastPrompt = data.prompt;
@@ -313,6 +328,25 @@ async function runScan() {
     }
 }
 
+// Read a newline-delimited JSON response, calling onRecord for each line as it arrives
+async function readNdjson(response, onRecord) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split("\n");
+        buffer = lines.pop();
+        for (const line of lines) {
+            if (line) onRecord(JSON.parse(line));
+        }
+    }
+    buffer += decoder.decode();
+    if (buffer.trim()) onRecord(JSON.parse(buffer));
+}
+
 // Also scan on Enter key in the path input
 document.getElementById("scan-path").addEventListener("keydown", (e) => {
     if (e.key === "Enter") runScan();